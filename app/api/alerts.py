@@ -3,20 +3,22 @@
 from typing import Optional, List
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 import logging
 
 from app.models.core import (
     CurrentAlertResponse, 
     HistoricalAlertsResponse, 
-    AlertResponse,
     SeverityLevel,
     ErrorResponse
 )
 from app.services.auth_service import get_current_user, UserSession
 from app.repositories.predictions import get_predictions_repository
-from app.repositories.api_usage import get_api_usage_repository
+from app.repositories.api_usage import UsageRecord
+from app.services.usage_logger import get_usage_logger
 from app.config import get_settings
+from app.utils.responses import UTCJSONResponse
 from app.middleware.subscription import (
     enforce_alerts_rate_limit,
     enforce_history_rate_limit,
@@ -26,17 +28,25 @@ from app.middleware.subscription import (
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter(prefix="/api/v1/alerts", tags=["Alerts"])
+router = APIRouter(
+    prefix="/api/v1/alerts",
+    tags=["Alerts"],
+    default_response_class=ORJSONResponse
+)
 security = HTTPBearer()
 predictions_repo = get_predictions_repository()
-api_usage_repo = get_api_usage_repository()
 settings = get_settings()
 
+# Settings are fixed for the life of the process; resolve them once
+_HIGH_THRESHOLD = settings.default_alert_thresholds.get('high', 0.8)
+_PREDICTION_INTERVAL = timedelta(minutes=settings.model.prediction_interval_minutes)
 
+# Alert message pieces for the history listing
+_SEVERITY_TITLE = {level: level.value.title() for level in SeverityLevel}
+_ALERT_MESSAGE = "%s severity solar flare prediction: %.1f%% probability"
 
 
-
-async def _log_api_usage(
+def _log_api_usage(
     request: Request,
     user_session: UserSession,
     endpoint: str,
@@ -44,26 +54,23 @@ async def _log_api_usage(
     status_code: int = 200,
     response_time_ms: Optional[int] = None
 ) -> None:
-    """Log API usage for analytics and rate limiting."""
-    try:
-        await api_usage_repo.create({
-            "user_id": user_session.user_id,
-            "endpoint": endpoint,
-            "method": method,
-            "status_code": status_code,
-            "response_time_ms": response_time_ms,
-            "ip_address": request.client.host if request.client else None,
-            "user_agent": request.headers.get("user-agent"),
-            "api_key_used": user_session.api_key is not None,
-            "timestamp": datetime.utcnow()
-        })
-    except Exception as e:
-        logger.warning(f"Failed to log API usage: {e}")
+    """Queue API usage for analytics; written in batches off the request path."""
+    get_usage_logger().log(UsageRecord(
+        user_session.user_id,
+        endpoint,
+        method,
+        status_code,
+        response_time_ms,
+        request.client.host if request.client else None,
+        request.headers.get("user-agent"),
+        user_session.api_key is not None,
+        datetime.utcnow()
+    ))
 
 
 @router.get(
     "/current",
-    response_model=CurrentAlertResponse,
+    responses={200: {"model": CurrentAlertResponse}},
     summary="Get Current Solar Flare Alert",
     description="Retrieve the current solar flare probability and alert status."
 )
@@ -72,7 +79,7 @@ async def get_current_alert(
     current_user: dict = Depends(get_current_user),
     subscription = Depends(require_api_access),
     rate_limit_info = Depends(enforce_alerts_rate_limit)
-) -> CurrentAlertResponse:
+):
     """
     Get the current solar flare alert status.
     
@@ -97,21 +104,24 @@ async def get_current_alert(
             )
         
         # Calculate next update time (predictions run every 10 minutes)
-        next_update = current_prediction.timestamp + timedelta(
-            minutes=settings.model.prediction_interval_minutes
-        )
+        next_update = current_prediction.timestamp + _PREDICTION_INTERVAL
         
         # Check if alert should be triggered based on user's thresholds
-        user_thresholds = subscription.alert_thresholds or settings.default_alert_thresholds
-        alert_active = current_prediction.flare_probability >= user_thresholds.get('high', 0.8)
+        if subscription.alert_thresholds:
+            high_threshold = subscription.alert_thresholds.get('high', 0.8)
+        else:
+            high_threshold = _HIGH_THRESHOLD
+        alert_active = current_prediction.flare_probability >= high_threshold
         
-        return CurrentAlertResponse(
-            current_probability=current_prediction.flare_probability,
-            severity_level=current_prediction.severity_level,
-            last_updated=current_prediction.timestamp,
-            next_update=next_update,
-            alert_active=alert_active
-        )
+        # Values come from an already-validated PredictionResult; emit the
+        # CurrentAlertResponse shape directly without re-validating it
+        return UTCJSONResponse({
+            "current_probability": current_prediction.flare_probability,
+            "severity_level": current_prediction.severity_level,
+            "last_updated": current_prediction.timestamp,
+            "next_update": next_update,
+            "alert_active": alert_active
+        })
         
     except HTTPException:
         raise
@@ -125,7 +135,7 @@ async def get_current_alert(
 
 @router.get(
     "/history",
-    response_model=HistoricalAlertsResponse,
+    responses={200: {"model": HistoricalAlertsResponse}},
     summary="Get Historical Solar Flare Alerts",
     description="Retrieve historical solar flare predictions with filtering and pagination."
 )
@@ -139,7 +149,7 @@ async def get_alert_history(
     min_probability: Optional[float] = Query(None, ge=0.0, le=1.0, description="Minimum probability threshold"),
     page: int = Query(1, ge=1, description="Page number for pagination"),
     page_size: int = Query(50, ge=1, le=100, description="Number of results per page")
-) -> HistoricalAlertsResponse:
+):
     """
     Get historical solar flare alert data with filtering and pagination.
     
@@ -169,56 +179,41 @@ async def get_alert_history(
         end_time = datetime.utcnow()
         start_time = end_time - timedelta(hours=hours_back)
         
-        # Get predictions with filters
-        if severity:
-            predictions = await predictions_repo.get_predictions_by_severity(
-                severity=severity,
-                hours_back=hours_back
-            )
-        elif min_probability is not None:
-            predictions = await predictions_repo.get_predictions_above_threshold(
-                probability_threshold=min_probability,
-                hours_back=hours_back
-            )
-        else:
-            predictions = await predictions_repo.get_predictions_by_time_range(
-                start_time=start_time,
-                end_time=end_time
-            )
-        
-        # Apply pagination
-        total_count = len(predictions)
-        start_idx = (page - 1) * page_size
-        end_idx = start_idx + page_size
-        paginated_predictions = predictions[start_idx:end_idx]
-        
-        # Convert to AlertResponse format
-        alerts = []
-        for prediction in paginated_predictions:
-            # Check if alert was triggered based on default thresholds
-            alert_triggered = prediction.flare_probability >= settings.default_alert_thresholds.get('high', 0.8)
-            
-            # Generate alert message
-            message = f"{prediction.severity_level.title()} severity solar flare prediction: {prediction.flare_probability:.1%} probability"
-            
-            alerts.append(AlertResponse(
-                id=prediction.id or f"pred_{int(prediction.timestamp.timestamp())}",
-                timestamp=prediction.timestamp,
-                flare_probability=prediction.flare_probability,
-                severity_level=prediction.severity_level,
-                alert_triggered=alert_triggered,
-                message=message
-            ))
+        # Filter and paginate in the database
+        paginated_predictions, total_count = await predictions_repo.query_predictions(
+            start_time=start_time,
+            end_time=end_time,
+            severity=severity,
+            min_probability=min_probability,
+            limit=page_size,
+            offset=(page - 1) * page_size
+        )
         
-        has_more = end_idx < total_count
+        # Rows are built as plain dicts in the AlertResponse shape and the
+        # response is returned directly, skipping model validation and
+        # jsonable_encoder. alert_triggered uses the default thresholds.
+        alerts = [
+            {
+                "id": prediction.id or f"pred_{int(prediction.timestamp.timestamp())}",
+                "timestamp": prediction.timestamp,
+                "flare_probability": prediction.flare_probability,
+                "severity_level": prediction.severity_level,
+                "alert_triggered": prediction.flare_probability >= _HIGH_THRESHOLD,
+                "message": _ALERT_MESSAGE % (
+                    _SEVERITY_TITLE[prediction.severity_level],
+                    prediction.flare_probability * 100
+                )
+            }
+            for prediction in paginated_predictions
+        ]
         
-        return HistoricalAlertsResponse(
-            alerts=alerts,
-            total_count=total_count,
-            page=page,
-            page_size=page_size,
-            has_more=has_more
-        )
+        return UTCJSONResponse({
+            "alerts": alerts,
+            "total_count": total_count,
+            "page": page,
+            "page_size": page_size,
+            "has_more": page * page_size < total_count
+        })
         
     except HTTPException:
         raise
@@ -250,13 +245,12 @@ async def get_alert_statistics(
     **Authentication Required**: Bearer token (JWT or API key)
     """
     try:
-        # Basic statistics for all tiers
-        stats = await predictions_repo.get_prediction_statistics(hours_back=hours_back)
-        
-        # Enterprise users get additional detailed statistics
-        if subscription.tier.value == "enterprise":
-            hourly_counts = await predictions_repo.get_hourly_prediction_counts(hours_back=hours_back)
-            stats["hourly_breakdown"] = hourly_counts
+        # Basic statistics for all tiers; enterprise users also get the
+        # hourly breakdown
+        stats = await predictions_repo.get_aggregated_statistics(
+            hours_back=hours_back,
+            include_hourly=subscription.tier.value == "enterprise"
+        )
         
         return {
             "statistics": stats,
@@ -341,7 +335,7 @@ async def export_alerts_csv(
         
         # Write data rows
         for prediction in predictions:
-            alert_triggered = prediction.flare_probability >= settings.default_alert_thresholds.get('high', 0.8)
+            alert_triggered = prediction.flare_probability >= _HIGH_THRESHOLD
             writer.writerow([
                 prediction.timestamp.isoformat(),
                 prediction.flare_probability,
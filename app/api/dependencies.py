@@ -7,9 +7,14 @@ import structlog
 from fastapi import HTTPException, Depends, Request
 from typing import Optional, Dict, Any
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
+import math
+import time
 
 from app.core.auth import get_current_user, get_current_user_optional, TokenData
 from app.services.cache import get_cache_service, CacheService
+from app.services.local_bucket import get_local_bucket_store
 from app.core.metrics import get_metrics_collector, track_api_request
 
 logger = structlog.get_logger()
@@ -21,6 +26,20 @@ TIER_LIMITS = {
     "enterprise": {"daily": 1000000, "per_minute": 1000}
 }
 
+# Token-bucket parameters per tier: refill at the daily quota spread over
+# the day, with the per-minute limit as burst capacity
+TIER_BUCKETS = {
+    tier: (limits["daily"] / 86400, limits["per_minute"])
+    for tier, limits in TIER_LIMITS.items()
+}
+_DEFAULT_BUCKET = TIER_BUCKETS["free"]
+
+# Seconds between reconciliations of a local bucket with the shared one
+BUCKET_SYNC_INTERVAL = 5.0
+
+# Tier ordering for require_tier comparisons
+_TIER_HIERARCHY = MappingProxyType({"free": 0, "pro": 1, "enterprise": 2})
+
 
 class RateLimitInfo:
     """Rate limit status for current request"""
@@ -31,10 +50,12 @@ class RateLimitInfo:
         self.tier = tier
 
 
-async def get_cache() -> CacheService:
-    """Get cache service dependency"""
-    cache = get_cache_service()
-    await cache.connect()
+async def get_cache(request: Request) -> CacheService:
+    """Get cache service dependency (connected once at startup)"""
+    cache = getattr(request.app.state, "cache", None)
+    if cache is None:
+        # App started without lifespan; CacheService connects lazily
+        cache = get_cache_service()
     return cache
 
 
@@ -52,52 +73,48 @@ async def check_rate_limit(
         RateLimitInfo with remaining calls and limit details
     """
     tier = user.tier or "free"
-    limits = TIER_LIMITS.get(tier, TIER_LIMITS["free"])
-    
-    # Check daily limit
-    daily_count = await cache.increment_rate_limit(user.user_id, window="day")
-    daily_limit = limits["daily"]
+    rate, burst = TIER_BUCKETS.get(tier, _DEFAULT_BUCKET)
+    
+    # Spend from the in-process bucket; only talk to the shared bucket
+    # when the local one runs dry or is due for reconciliation
+    now = time.time()
+    bucket = get_local_bucket_store().get(user.user_id, burst, now)
+    allowed = bucket.consume(rate, burst, now)
+    
+    if not allowed or now - bucket.synced_at >= BUCKET_SYNC_INTERVAL:
+        shared_allowed, tokens = await cache.token_bucket_consume(
+            user.user_id,
+            "requests",
+            rate=rate,
+            burst=burst,
+            spent=bucket.pending,
+            take=0 if allowed else 1
+        )
+        bucket.sync(tokens, now)
+        allowed = allowed or shared_allowed
     
-    if daily_count > daily_limit:
-        logger.warning("rate_limit_exceeded", user_id=user.user_id, tier=tier, type="daily")
+    if not allowed:
+        retry_after = math.ceil((1 - bucket.tokens) / rate)
+        logger.warning("rate_limit_exceeded", user_id=user.user_id, tier=tier)
         raise HTTPException(
             status_code=429,
             detail={
                 "error": "Rate limit exceeded",
-                "message": f"Daily limit of {daily_limit} requests exceeded. Upgrade your plan for higher limits.",
-                "limit": daily_limit,
+                "message": f"Rate limit of {round(rate * 86400)} requests per day (bursts of {burst}) exceeded. "
+                           f"Upgrade your plan for higher limits.",
+                "limit": burst,
                 "tier": tier,
                 "upgrade_url": "/pricing"
             },
-            headers={"Retry-After": "86400", "X-RateLimit-Limit": str(daily_limit), "X-RateLimit-Remaining": "0"}
-        )
-    
-    # Check per-minute limit
-    minute_count = await cache.increment_rate_limit(user.user_id, window="minute")
-    minute_limit = limits["per_minute"]
-    
-    if minute_count > minute_limit:
-        logger.warning("rate_limit_exceeded", user_id=user.user_id, tier=tier, type="minute")
-        raise HTTPException(
-            status_code=429,
-            detail={
-                "error": "Rate limit exceeded",
-                "message": f"Per-minute limit of {minute_limit} requests exceeded. Please slow down.",
-                "limit": minute_limit,
-                "tier": tier
-            },
-            headers={"Retry-After": "60", "X-RateLimit-Limit": str(minute_limit), "X-RateLimit-Remaining": "0"}
+            headers={"Retry-After": str(retry_after), "X-RateLimit-Limit": str(burst), "X-RateLimit-Remaining": "0"}
         )
     
-    remaining = daily_limit - daily_count
-    
-    # Calculate reset time (midnight UTC)
-    now = datetime.utcnow()
-    reset_at = datetime(now.year, now.month, now.day, 23, 59, 59).isoformat() + "Z"
+    # The bucket is full again once the missing tokens have refilled
+    reset_at = datetime.utcfromtimestamp(now + (burst - bucket.tokens) / rate).isoformat() + "Z"
     
     return RateLimitInfo(
-        remaining=remaining,
-        limit=daily_limit,
+        remaining=int(bucket.tokens),
+        limit=burst,
         reset_at=reset_at,
         tier=tier
     )
@@ -118,21 +135,25 @@ async def optional_rate_limit(
     return await check_rate_limit(user, cache)
 
 
+@lru_cache(maxsize=None)
 def require_tier(required_tier: str):
     """
     Dependency factory for tier-gated endpoints
     
+    Memoized so every route gated on the same tier shares one dependency
+    callable, which FastAPI resolves once per request
+    
     Usage:
         @app.get("/enterprise-only")
         async def enterprise_endpoint(user = Depends(require_tier("enterprise"))):
             ...
     """
-    tier_hierarchy = {"free": 0, "pro": 1, "enterprise": 2}
+    required_level = _TIER_HIERARCHY.get(required_tier, 0)
     
     async def tier_dependency(user: TokenData = Depends(get_current_user)) -> TokenData:
         user_tier = user.tier or "free"
         
-        if tier_hierarchy.get(user_tier, 0) < tier_hierarchy.get(required_tier, 0):
+        if _TIER_HIERARCHY.get(user_tier, 0) < required_level:
             raise HTTPException(
                 status_code=403,
                 detail={
@@ -157,12 +178,12 @@ class RequestTimer:
         self.start_time = None
     
     def __enter__(self):
-        self.start_time = datetime.utcnow()
+        self.start_time = time.perf_counter()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.start_time:
-            duration_ms = (datetime.utcnow() - self.start_time).total_seconds() * 1000
+        if self.start_time is not None:
+            duration_ms = (time.perf_counter() - self.start_time) * 1000
             status_code = 500 if exc_type else 200
             track_api_request(self.endpoint, status_code, duration_ms)
 
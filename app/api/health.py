@@ -1,8 +1,8 @@
 """Health check and monitoring endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import JSONResponse
-from typing import Dict, Any, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse, Response
+from typing import Dict, Any, Optional, Tuple, Callable, Awaitable
 from datetime import datetime, timedelta
 import asyncio
 import time
@@ -21,64 +21,162 @@ except ImportError:
         mock_db.fetch_one = AsyncMock(return_value={"test": 1})
         return mock_db
 from app.utils.logging import get_logger, metrics_collector
-from app.services.model_inference import ModelInferenceService
+from app.services.model_inference import ModelInferenceService, get_model_service
 
-router = APIRouter(prefix="/health", tags=["Health & Monitoring"])
+router = APIRouter(
+    prefix="/health",
+    tags=["Health & Monitoring"],
+    default_response_class=ORJSONResponse
+)
 logger = get_logger(__name__)
 
+_SERVICE_NAME = "ZERO-COMP Solar Weather API"
+_SERVICE_VERSION = get_settings().api.app_version
 
-@router.get("/", response_model=HealthStatus)
+# Probe bodies are constant apart from the timestamp
+_LIVENESS_PREFIX = b'{"status":"alive","timestamp":"'
+_LIVENESS_SUFFIX = b'Z"}'
+
+# Upper bound on a probe's database round-trip
+_DB_PROBE_TIMEOUT = 2.0
+
+# Scrapers poll /metrics and /detailed from several observers; serve the
+# last result for this long (seconds) instead of recomputing it
+_RESULT_TTL = 1.0
+_result_cache: Dict[str, Tuple[float, Any]] = {"metrics": (0.0, None), "detailed": (0.0, None)}
+# Created on first use so they bind to the serving event loop
+_result_locks: Dict[str, asyncio.Lock] = {}
+
+
+async def _cached_result(key: str, build: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the cached result for key, rebuilding it at most once per TTL."""
+    cached_at, value = _result_cache[key]
+    if time.monotonic() - cached_at < _RESULT_TTL:
+        return value
+    
+    lock = _result_locks.get(key)
+    if lock is None:
+        lock = _result_locks[key] = asyncio.Lock()
+    
+    async with lock:
+        # Another caller may have rebuilt it while we waited
+        cached_at, value = _result_cache[key]
+        if time.monotonic() - cached_at < _RESULT_TTL:
+            return value
+        
+        value = await build()
+        _result_cache[key] = (time.monotonic(), value)
+        return value
+
+
+async def get_database_for_health(request: Request):
+    """Database handle for probes: the dedicated health pool when available."""
+    health_db = getattr(request.app.state, "health_db", None)
+    if health_db is None:
+        return await get_database()
+    return health_db
+
+
+@router.get("/", responses={200: {"model": HealthStatus}})
 async def basic_health_check():
     """Basic health check endpoint."""
-    return HealthStatus(
-        status="healthy",
-        timestamp=datetime.utcnow(),
-        service="ZERO-COMP Solar Weather API",
-        version=get_settings().api.app_version
-    )
+    return ORJSONResponse({
+        "status": "healthy",
+        "timestamp": datetime.utcnow(),
+        "service": _SERVICE_NAME,
+        "version": _SERVICE_VERSION
+    })
 
 
 @router.get("/detailed", response_model=Dict[str, Any])
-async def detailed_health_check(db=Depends(get_database)):
+async def detailed_health_check(
+    db=Depends(get_database_for_health),
+    model_service: ModelInferenceService = Depends(get_model_service)
+):
     """Detailed health check with component status."""
-    start_time = time.time()
-    health_data = {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "service": get_settings().api.app_name,
-        "version": get_settings().api.app_version,
-        "environment": get_settings().environment,
-        "components": {}
-    }
+    async def build() -> Tuple[bytes, int]:
+        start_time = time.time()
+        health_data = {
+            "status": "healthy",
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "service": get_settings().api.app_name,
+            "version": get_settings().api.app_version,
+            "environment": get_settings().environment,
+            "components": {}
+        }
+        
+        # Component checks are independent I/O; run them concurrently
+        database, ml_model, external_services = await asyncio.gather(
+            _check_database(db),
+            _check_model(model_service),
+            check_external_services()
+        )
+        
+        health_data["components"]["database"] = database
+        health_data["components"]["ml_model"] = ml_model
+        health_data["components"]["external_services"] = external_services
+        
+        if "error" in database or "error" in ml_model:
+            health_data["status"] = "degraded"
+        
+        # System metrics
+        health_data["system_metrics"] = get_system_metrics()
+        
+        total_time = time.time() - start_time
+        health_data["response_time_ms"] = round(total_time * 1000, 2)
+        
+        # Record health check metrics
+        metrics_collector.record_api_metrics(
+            endpoint="/health/detailed",
+            method="GET",
+            response_time=total_time,
+            status_code=200 if health_data["status"] == "healthy" else 503
+        )
+        
+        status_code = 200 if health_data["status"] == "healthy" else 503
+        # Cache the encoded body so repeat callers skip serialization too
+        return ORJSONResponse(content=health_data, status_code=status_code).body, status_code
     
-    # Check database connectivity
+    content, status_code = await _cached_result("detailed", build)
+    return Response(content=content, status_code=status_code, media_type="application/json")
+
+
+async def _check_database(db) -> Dict[str, Any]:
+    """Check database connectivity."""
     try:
         db_start = time.time()
-        result = await db.fetch_one("SELECT 1 as test")
+        result = await asyncio.wait_for(db.fetch_one("SELECT 1 as test"), timeout=_DB_PROBE_TIMEOUT)
         db_time = time.time() - db_start
         
-        health_data["components"]["database"] = {
+        return {
             "status": "healthy" if result else "unhealthy",
             "response_time_ms": round(db_time * 1000, 2),
             "last_checked": datetime.utcnow().isoformat() + "Z"
         }
+    except asyncio.TimeoutError:
+        logger.error("Database health check timed out")
+        return {
+            "status": "unhealthy",
+            "error": "timeout",
+            "last_checked": datetime.utcnow().isoformat() + "Z"
+        }
     except Exception as e:
         logger.error("Database health check failed", exception=e)
-        health_data["components"]["database"] = {
+        return {
             "status": "unhealthy",
             "error": str(e),
             "last_checked": datetime.utcnow().isoformat() + "Z"
         }
-        health_data["status"] = "degraded"
-    
-    # Check ML model availability
+
+
+async def _check_model(model_service: ModelInferenceService) -> Dict[str, Any]:
+    """Check ML model availability."""
     try:
         model_start = time.time()
-        model_service = ModelInferenceService()
         model_available = await model_service.check_model_health()
         model_time = time.time() - model_start
         
-        health_data["components"]["ml_model"] = {
+        return {
             "status": "healthy" if model_available else "unhealthy",
             "response_time_ms": round(model_time * 1000, 2),
             "model_version": get_settings().model.model_name,
@@ -86,43 +184,30 @@ async def detailed_health_check(db=Depends(get_database)):
         }
     except Exception as e:
         logger.error("ML model health check failed", exception=e)
-        health_data["components"]["ml_model"] = {
+        return {
             "status": "unhealthy",
             "error": str(e),
             "last_checked": datetime.utcnow().isoformat() + "Z"
         }
-        health_data["status"] = "degraded"
-    
-    # Check external services
-    health_data["components"]["external_services"] = await check_external_services()
-    
-    # System metrics
-    health_data["system_metrics"] = get_system_metrics()
-    
-    total_time = time.time() - start_time
-    health_data["response_time_ms"] = round(total_time * 1000, 2)
-    
-    # Record health check metrics
-    metrics_collector.record_api_metrics(
-        endpoint="/health/detailed",
-        method="GET",
-        response_time=total_time,
-        status_code=200 if health_data["status"] == "healthy" else 503
-    )
-    
-    status_code = 200 if health_data["status"] == "healthy" else 503
-    return JSONResponse(content=health_data, status_code=status_code)
 
 
 @router.get("/readiness")
-async def readiness_check(db=Depends(get_database)):
+async def readiness_check(
+    db=Depends(get_database_for_health),
+    model_service: ModelInferenceService = Depends(get_model_service)
+):
     """Kubernetes readiness probe endpoint."""
     try:
         # Check if database is accessible
-        await db.fetch_one("SELECT 1")
+        try:
+            await asyncio.wait_for(db.fetch_one("SELECT 1"), timeout=_DB_PROBE_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Database check timed out"
+            )
         
         # Check if critical services are ready
-        model_service = ModelInferenceService()
         model_ready = await model_service.check_model_health()
         
         if not model_ready:
@@ -144,13 +229,19 @@ async def readiness_check(db=Depends(get_database)):
 @router.get("/liveness")
 async def liveness_check():
     """Kubernetes liveness probe endpoint."""
-    return {"status": "alive", "timestamp": datetime.utcnow()}
+    return Response(
+        content=_LIVENESS_PREFIX + datetime.utcnow().isoformat().encode() + _LIVENESS_SUFFIX,
+        media_type="application/json"
+    )
 
 
 @router.get("/metrics", response_model=SystemMetrics)
 async def system_metrics():
     """Get detailed system performance metrics."""
-    return SystemMetrics(**get_system_metrics())
+    async def build() -> SystemMetrics:
+        return SystemMetrics(**get_system_metrics())
+    
+    return await _cached_result("metrics", build)
 
 
 async def check_external_services() -> Dict[str, Any]:
@@ -205,27 +296,100 @@ async def check_external_services() -> Dict[str, Any]:
     return services
 
 
+class _SystemSampler:
+    """
+    Background sampler for the slow psutil probes.
+    
+    CPU usage is taken as a non-blocking delta every `cpu_interval` seconds;
+    disk usage and per-process thread/file/connection counts (which walk
+    /proc) are refreshed every `slow_interval` seconds.
+    """
+    
+    def __init__(self, cpu_interval: float = 5.0, slow_interval: float = 30.0):
+        self.cpu_interval = cpu_interval
+        self.slow_interval = slow_interval
+        self.process = psutil.Process(os.getpid())
+        self.cpu_percent = 0.0
+        self.disk = None
+        self.threads = 0
+        self.open_files = 0
+        self.connections = 0
+        self._task: Optional[asyncio.Task] = None
+    
+    def refresh_cpu(self) -> None:
+        self.cpu_percent = psutil.cpu_percent(interval=None)
+    
+    def refresh_slow(self) -> None:
+        self.disk = psutil.disk_usage('/')
+        self.threads = self.process.num_threads()
+        self.open_files = len(self.process.open_files())
+        self.connections = len(self.process.connections())
+    
+    async def start(self) -> None:
+        if self._task is None:
+            # Prime the CPU delta so the first sample is meaningful
+            psutil.cpu_percent(interval=None)
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    async def _run(self) -> None:
+        elapsed = self.slow_interval
+        while True:
+            try:
+                if elapsed >= self.slow_interval:
+                    self.refresh_slow()
+                    elapsed = 0.0
+                await asyncio.sleep(self.cpu_interval)
+                elapsed += self.cpu_interval
+                self.refresh_cpu()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error("System metrics sampling failed", exception=e)
+                await asyncio.sleep(self.cpu_interval)
+
+
+_system_sampler = _SystemSampler()
+
+
+async def start_system_sampler() -> None:
+    """Start background sampling of system metrics."""
+    await _system_sampler.start()
+
+
+async def stop_system_sampler() -> None:
+    """Stop background sampling of system metrics."""
+    await _system_sampler.stop()
+
+
 def get_system_metrics() -> Dict[str, Any]:
     """Get current system performance metrics."""
     try:
-        # CPU metrics
-        cpu_percent = psutil.cpu_percent(interval=1)
-        cpu_count = psutil.cpu_count()
+        sampler = _system_sampler
+        if sampler.disk is None:
+            sampler.refresh_slow()
         
         # Memory metrics
         memory = psutil.virtual_memory()
         
         # Disk metrics
-        disk = psutil.disk_usage('/')
+        disk = sampler.disk
         
         # Process metrics
-        process = psutil.Process(os.getpid())
-        process_memory = process.memory_info()
+        process_memory = sampler.process.memory_info()
         
         return {
             "cpu": {
-                "usage_percent": cpu_percent,
-                "count": cpu_count,
+                "usage_percent": sampler.cpu_percent,
+                "count": psutil.cpu_count(),
                 "load_average": list(os.getloadavg()) if hasattr(os, 'getloadavg') else None
             },
             "memory": {
@@ -243,10 +407,10 @@ def get_system_metrics() -> Dict[str, Any]:
                 "usage_percent": (disk.used / disk.total) * 100
             },
             "process": {
-                "pid": os.getpid(),
-                "threads": process.num_threads(),
-                "open_files": len(process.open_files()),
-                "connections": len(process.connections())
+                "pid": sampler.process.pid,
+                "threads": sampler.threads,
+                "open_files": sampler.open_files,
+                "connections": sampler.connections
             },
             "timestamp": datetime.utcnow().isoformat() + "Z"
         }
@@ -255,4 +419,4 @@ def get_system_metrics() -> Dict[str, Any]:
         return {
             "error": str(e),
             "timestamp": datetime.utcnow().isoformat() + "Z"
-        }
\ No newline at end of file
+        }
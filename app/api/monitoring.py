@@ -1,21 +1,82 @@
 """Monitoring and alerting API endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse, Response
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from dataclasses import asdict, fields
+from datetime import datetime
+from enum import Enum
+import hashlib
+import time
+import numpy as np
+import orjson
+from tsdownsample import (
+    EveryNthDownsampler,
+    LTTBDownsampler,
+    MinMaxDownsampler,
+    MinMaxLTTBDownsampler
+)
 
-from app.services.monitoring import get_alerting_service, AlertSeverity, AlertType
+from app.services.monitoring import (
+    get_alerting_service,
+    AlertingService,
+    AlertSeverity,
+    AlertType,
+    MonitoringThresholds
+)
 from app.models.core import SystemMetrics
 from app.utils.logging import get_logger
 
-router = APIRouter(prefix="/monitoring", tags=["Monitoring & Alerting"])
+router = APIRouter(
+    prefix="/monitoring",
+    tags=["Monitoring & Alerting"],
+    default_response_class=ORJSONResponse
+)
 logger = get_logger(__name__)
 
+# Upper bound on points returned by /metrics/history
+_MAX_HISTORY_POINTS = 100
+
+# Alert datetimes are naive UTC; keep the "...Z" format clients expect
+_ALERT_JSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class DownsampleAlgorithm(str, Enum):
+    """Downsampling algorithms for metrics history."""
+    EVERYNTH = "everynth"
+    MINMAX = "minmax"
+    LTTB = "lttb"
+    MINMAXLTTB = "minmaxlttb"
+
+
+_DOWNSAMPLERS = {
+    DownsampleAlgorithm.EVERYNTH: EveryNthDownsampler(),
+    DownsampleAlgorithm.MINMAX: MinMaxDownsampler(),
+    DownsampleAlgorithm.LTTB: LTTBDownsampler(),
+    DownsampleAlgorithm.MINMAXLTTB: MinMaxLTTBDownsampler()
+}
+
+# Threshold names, which are also the PUT /thresholds parameter names
+_THRESHOLD_FIELDS = tuple(f.name for f in fields(MonitoringThresholds))
+
+# Encoded GET /thresholds response and its ETag; rebuilt by PUT /thresholds
+_thresholds_body: Optional[bytes] = None
+_thresholds_etag: Optional[str] = None
+_THRESHOLDS_UPDATED_PREFIX = b'{"message":"Thresholds updated successfully","thresholds":'
+
+
+async def get_alerting(request: Request) -> AlertingService:
+    """Get the alerting service dependency (resolved once at startup)."""
+    alerting_service = getattr(request.app.state, "alerting", None)
+    if alerting_service is None:
+        # App started without lifespan
+        alerting_service = get_alerting_service()
+    return alerting_service
+
 
 @router.get("/status")
-async def get_system_status():
+async def get_system_status(alerting_service: AlertingService = Depends(get_alerting)):
     """Get overall system status and active alerts."""
-    alerting_service = get_alerting_service()
     return alerting_service.get_system_status()
 
 
@@ -24,41 +85,28 @@ async def get_alerts(
     active_only: bool = Query(False, description="Return only active alerts"),
     severity: Optional[AlertSeverity] = Query(None, description="Filter by severity"),
     alert_type: Optional[AlertType] = Query(None, description="Filter by alert type"),
-    limit: int = Query(100, ge=1, le=1000, description="Maximum number of alerts to return")
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of alerts to return"),
+    alerting_service: AlertingService = Depends(get_alerting)
 ):
     """Get system alerts with optional filtering."""
-    alerting_service = get_alerting_service()
-    
-    if active_only:
-        alerts = alerting_service.monitor.get_active_alerts()
-    else:
-        alerts = alerting_service.monitor.get_alert_history(limit)
-    
-    # Apply filters
-    if severity:
-        alerts = [alert for alert in alerts if alert.severity == severity]
-    
-    if alert_type:
-        alerts = [alert for alert in alerts if alert.type == alert_type]
+    # Filters are applied by the monitor, next to the alert store
+    alerts = alerting_service.monitor.get_alert_history(
+        limit,
+        severity=severity,
+        alert_type=alert_type,
+        active_only=active_only
+    )
     
-    # Convert to response format
-    return {
-        "alerts": [
-            {
-                "id": alert.id,
-                "type": alert.type.value,
-                "severity": alert.severity.value,
-                "message": alert.message,
-                "timestamp": alert.timestamp.isoformat() + "Z",
-                "resolved": alert.resolved,
-                "resolved_at": alert.resolved_at.isoformat() + "Z" if alert.resolved_at else None,
-                "metadata": alert.metadata
-            }
-            for alert in alerts
-        ],
-        "total_count": len(alerts),
-        "active_count": len([a for a in alerts if not a.resolved])
-    }
+    # Alert is a dataclass with the response's field layout, so orjson
+    # encodes the objects directly; no per-alert dicts are built
+    return Response(
+        content=orjson.dumps({
+            "alerts": alerts,
+            "total_count": len(alerts),
+            "active_count": sum(1 for alert in alerts if not alert.resolved)
+        }, option=_ALERT_JSON_OPTIONS),
+        media_type="application/json"
+    )
 
 
 @router.post("/alerts/custom")
@@ -66,11 +114,10 @@ async def trigger_custom_alert(
     alert_type: AlertType,
     severity: AlertSeverity,
     message: str,
-    metadata: Optional[Dict[str, Any]] = None
+    metadata: Optional[Dict[str, Any]] = None,
+    alerting_service: AlertingService = Depends(get_alerting)
 ):
     """Trigger a custom alert (for testing or manual alerts)."""
-    alerting_service = get_alerting_service()
-    
     await alerting_service.monitor.trigger_custom_alert(
         alert_type=alert_type,
         severity=severity,
@@ -86,9 +133,8 @@ async def trigger_custom_alert(
 
 
 @router.get("/metrics/current")
-async def get_current_metrics():
+async def get_current_metrics(alerting_service: AlertingService = Depends(get_alerting)):
     """Get current system performance metrics."""
-    alerting_service = get_alerting_service()
     metrics = await alerting_service.monitor.check_system_health()
     return metrics
 
@@ -96,96 +142,57 @@ async def get_current_metrics():
 @router.get("/metrics/history")
 async def get_metrics_history(
     hours: int = Query(1, ge=1, le=24, description="Number of hours of history to return"),
-    resolution: int = Query(60, ge=30, le=3600, description="Resolution in seconds")
+    resolution: int = Query(60, ge=30, le=3600, description="Resolution in seconds"),
+    algorithm: DownsampleAlgorithm = Query(DownsampleAlgorithm.LTTB, description="Downsampling algorithm"),
+    alerting_service: AlertingService = Depends(get_alerting)
 ):
     """Get historical system metrics."""
-    alerting_service = get_alerting_service()
+    # Get metrics within the time range
+    timestamps, filtered_metrics = alerting_service.monitor.get_metrics_window(time.time() - hours * 3600)
     
-    # Get all metrics history
-    all_metrics = alerting_service.monitor.get_metrics_history(1000)
-    
-    if not all_metrics:
+    if not filtered_metrics:
         return {"metrics": [], "total_count": 0}
     
-    # Filter by time range
-    cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-    filtered_metrics = []
-    
-    for metric in all_metrics:
-        try:
-            metric_time = datetime.fromisoformat(metric["timestamp"].replace("Z", "+00:00"))
-            if metric_time >= cutoff_time:
-                filtered_metrics.append(metric)
-        except (KeyError, ValueError):
-            continue
-    
-    # Apply resolution (downsample if needed)
-    if len(filtered_metrics) > 100:  # Downsample if too many points
-        step = max(1, len(filtered_metrics) // 100)
-        filtered_metrics = filtered_metrics[::step]
+    # Downsample to the requested resolution, capped at _MAX_HISTORY_POINTS,
+    # selecting points on the CPU series so peaks and troughs survive
+    n_out = min(_MAX_HISTORY_POINTS, max(4, hours * 3600 // resolution))
+    n_out -= n_out % 2
+    if len(filtered_metrics) > n_out:
+        y = np.fromiter((m["cpu"]["usage_percent"] for m in filtered_metrics), dtype=np.float64, count=len(filtered_metrics))
+        downsampler = _DOWNSAMPLERS[algorithm]
+        if algorithm is DownsampleAlgorithm.EVERYNTH:
+            indices = downsampler.downsample(y, n_out=n_out)
+        else:
+            indices = downsampler.downsample(np.asarray(timestamps, dtype=np.float64), y, n_out=n_out)
+        filtered_metrics = [filtered_metrics[i] for i in indices.tolist()]
     
     return {
         "metrics": filtered_metrics,
         "total_count": len(filtered_metrics),
         "time_range_hours": hours,
-        "resolution_seconds": resolution
+        "resolution_seconds": resolution,
+        "algorithm": algorithm.value
     }
 
 
 @router.get("/metrics/summary")
 async def get_metrics_summary(
-    hours: int = Query(24, ge=1, le=168, description="Number of hours for summary")
+    hours: int = Query(24, ge=1, le=168, description="Number of hours for summary"),
+    alerting_service: AlertingService = Depends(get_alerting)
 ):
     """Get summarized metrics over a time period."""
-    alerting_service = get_alerting_service()
-    
-    # Get metrics history
-    all_metrics = alerting_service.monitor.get_metrics_history(1000)
-    
-    if not all_metrics:
-        return {"summary": {}, "period_hours": hours}
-    
-    # Filter by time range
-    cutoff_time = datetime.utcnow() - timedelta(hours=hours)
-    filtered_metrics = []
+    window = hours * 3600
     
-    for metric in all_metrics:
-        try:
-            metric_time = datetime.fromisoformat(metric["timestamp"].replace("Z", "+00:00"))
-            if metric_time >= cutoff_time:
-                filtered_metrics.append(metric)
-        except (KeyError, ValueError):
-            continue
+    # Standard windows are aggregated as samples arrive; other periods are
+    # computed from the history buffer
+    if window in alerting_service.monitor.metrics_windows:
+        summary = alerting_service.monitor.get_window_summary(window)
+    else:
+        summary = alerting_service.monitor.summarize_metrics_since(time.time() - window)
     
-    if not filtered_metrics:
+    if summary is None:
         return {"summary": {}, "period_hours": hours}
     
-    # Calculate summary statistics
-    cpu_values = [m["cpu"]["usage_percent"] for m in filtered_metrics if "cpu" in m]
-    memory_values = [m["memory"]["usage_percent"] for m in filtered_metrics if "memory" in m]
-    disk_values = [m["disk"]["usage_percent"] for m in filtered_metrics if "disk" in m]
-    
-    summary = {
-        "cpu": {
-            "avg": sum(cpu_values) / len(cpu_values) if cpu_values else 0,
-            "min": min(cpu_values) if cpu_values else 0,
-            "max": max(cpu_values) if cpu_values else 0
-        },
-        "memory": {
-            "avg": sum(memory_values) / len(memory_values) if memory_values else 0,
-            "min": min(memory_values) if memory_values else 0,
-            "max": max(memory_values) if memory_values else 0
-        },
-        "disk": {
-            "avg": sum(disk_values) / len(disk_values) if disk_values else 0,
-            "min": min(disk_values) if disk_values else 0,
-            "max": max(disk_values) if disk_values else 0
-        },
-        "data_points": len(filtered_metrics),
-        "period_start": filtered_metrics[0]["timestamp"] if filtered_metrics else None,
-        "period_end": filtered_metrics[-1]["timestamp"] if filtered_metrics else None
-    }
-    
     return {
         "summary": summary,
         "period_hours": hours,
@@ -193,26 +200,33 @@ async def get_metrics_summary(
     }
 
 
+def _build_thresholds_body(thresholds: MonitoringThresholds) -> bytes:
+    """Encode the thresholds and store them as the cached GET response."""
+    global _thresholds_body, _thresholds_etag
+    
+    _thresholds_body = orjson.dumps(asdict(thresholds))
+    _thresholds_etag = f'"{hashlib.md5(_thresholds_body).hexdigest()}"'
+    return _thresholds_body
+
+
 @router.get("/thresholds")
-async def get_monitoring_thresholds():
+async def get_monitoring_thresholds(
+    request: Request,
+    alerting_service: AlertingService = Depends(get_alerting)
+):
     """Get current monitoring thresholds."""
-    alerting_service = get_alerting_service()
-    thresholds = alerting_service.monitor.thresholds
+    # Thresholds only change through PUT, which rebuilds the cached body
+    if _thresholds_body is None:
+        _build_thresholds_body(alerting_service.monitor.thresholds)
     
-    return {
-        "cpu_warning": thresholds.cpu_warning,
-        "cpu_critical": thresholds.cpu_critical,
-        "memory_warning": thresholds.memory_warning,
-        "memory_critical": thresholds.memory_critical,
-        "disk_warning": thresholds.disk_warning,
-        "disk_critical": thresholds.disk_critical,
-        "response_time_warning": thresholds.response_time_warning,
-        "response_time_critical": thresholds.response_time_critical,
-        "error_rate_warning": thresholds.error_rate_warning,
-        "error_rate_critical": thresholds.error_rate_critical,
-        "prediction_failure_threshold": thresholds.prediction_failure_threshold,
-        "websocket_connection_limit": thresholds.websocket_connection_limit
-    }
+    if request.headers.get("if-none-match") == _thresholds_etag:
+        return Response(status_code=304, headers={"ETag": _thresholds_etag})
+    
+    return Response(
+        content=_thresholds_body,
+        media_type="application/json",
+        headers={"ETag": _thresholds_etag}
+    )
 
 
 @router.put("/thresholds")
@@ -228,64 +242,33 @@ async def update_monitoring_thresholds(
     error_rate_warning: Optional[float] = None,
     error_rate_critical: Optional[float] = None,
     prediction_failure_threshold: Optional[int] = None,
-    websocket_connection_limit: Optional[int] = None
+    websocket_connection_limit: Optional[int] = None,
+    alerting_service: AlertingService = Depends(get_alerting)
 ):
     """Update monitoring thresholds."""
-    alerting_service = get_alerting_service()
+    updates = locals()
     thresholds = alerting_service.monitor.thresholds
     
-    # Update provided thresholds
-    if cpu_warning is not None:
-        thresholds.cpu_warning = cpu_warning
-    if cpu_critical is not None:
-        thresholds.cpu_critical = cpu_critical
-    if memory_warning is not None:
-        thresholds.memory_warning = memory_warning
-    if memory_critical is not None:
-        thresholds.memory_critical = memory_critical
-    if disk_warning is not None:
-        thresholds.disk_warning = disk_warning
-    if disk_critical is not None:
-        thresholds.disk_critical = disk_critical
-    if response_time_warning is not None:
-        thresholds.response_time_warning = response_time_warning
-    if response_time_critical is not None:
-        thresholds.response_time_critical = response_time_critical
-    if error_rate_warning is not None:
-        thresholds.error_rate_warning = error_rate_warning
-    if error_rate_critical is not None:
-        thresholds.error_rate_critical = error_rate_critical
-    if prediction_failure_threshold is not None:
-        thresholds.prediction_failure_threshold = prediction_failure_threshold
-    if websocket_connection_limit is not None:
-        thresholds.websocket_connection_limit = websocket_connection_limit
+    # Update provided thresholds; parameters are named after the fields
+    for name in _THRESHOLD_FIELDS:
+        value = updates[name]
+        if value is not None:
+            setattr(thresholds, name, value)
+    
+    # Refresh the cached GET response and reuse its bytes in the reply
+    body = _build_thresholds_body(thresholds)
     
     logger.info("Monitoring thresholds updated")
     
-    return {
-        "message": "Thresholds updated successfully",
-        "thresholds": {
-            "cpu_warning": thresholds.cpu_warning,
-            "cpu_critical": thresholds.cpu_critical,
-            "memory_warning": thresholds.memory_warning,
-            "memory_critical": thresholds.memory_critical,
-            "disk_warning": thresholds.disk_warning,
-            "disk_critical": thresholds.disk_critical,
-            "response_time_warning": thresholds.response_time_warning,
-            "response_time_critical": thresholds.response_time_critical,
-            "error_rate_warning": thresholds.error_rate_warning,
-            "error_rate_critical": thresholds.error_rate_critical,
-            "prediction_failure_threshold": thresholds.prediction_failure_threshold,
-            "websocket_connection_limit": thresholds.websocket_connection_limit
-        }
-    }
+    return Response(
+        content=_THRESHOLDS_UPDATED_PREFIX + body + b"}",
+        media_type="application/json"
+    )
 
 
 @router.post("/test")
-async def test_monitoring_system():
+async def test_monitoring_system(alerting_service: AlertingService = Depends(get_alerting)):
     """Test the monitoring system by triggering test alerts."""
-    alerting_service = get_alerting_service()
-    
     # Trigger test alerts
     await alerting_service.monitor.trigger_custom_alert(
         AlertType.CPU_HIGH,
@@ -301,5 +284,5 @@ async def test_monitoring_system():
         "message": "Monitoring system test completed",
         "test_alert_triggered": True,
         "current_metrics": metrics,
-        "active_alerts": len(alerting_service.monitor.get_active_alerts())
+        "active_alerts": alerting_service.monitor.active_alert_count
     }
\ No newline at end of file
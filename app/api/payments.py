@@ -1,10 +1,12 @@
 """Payment and subscription API endpoints."""
 
 from fastapi import APIRouter, HTTPException, Depends, Request, BackgroundTasks
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.security import HTTPBearer
 import structlog
-from typing import Dict, Any
-import json
+from typing import Dict, Any, Optional
+import hashlib
+import orjson
 
 from app.services.razorpay_service import get_razorpay_service, RazorpayService
 from app.services.auth_service import get_current_user
@@ -19,19 +21,34 @@ from app.models.subscription import (
 )
 from app.models.core import SubscriptionTier
 from app.repositories.subscriptions import get_subscriptions_repository
+from app.config import get_settings
 
 logger = structlog.get_logger(__name__)
-router = APIRouter(prefix="/api/v1/payments", tags=["payments"])
+router = APIRouter(prefix="/api/v1/payments", tags=["payments"], default_response_class=ORJSONResponse)
 security = HTTPBearer()
 
+# Monthly price per tier, from the subscription tier settings
+_TIER_PRICE = {
+    SubscriptionTier(tier): config["price"]
+    for tier, config in get_settings().subscription_tiers.items()
+}
 
-@router.post("/create-payment-link", response_model=PaymentLinkResponse)
+# Largest webhook body accepted, in bytes
+_MAX_WEBHOOK_BYTES = 1 << 20
+
+# Encoded GET /plans response and its ETag, built on first request
+_plans_body: Optional[bytes] = None
+_plans_etag: Optional[str] = None
+
+
+@router.post("/create-payment-link", responses={200: {"model": PaymentLinkResponse}})
 async def create_payment_link(
     request: PaymentLinkRequest,
     current_user: dict = Depends(get_current_user),
     razorpay_service: RazorpayService = Depends(get_razorpay_service)
 ):
     """Create a payment link for subscription upgrade."""
+    log = logger.bind(user_id=current_user["id"])
     try:
         if not razorpay_service.is_configured():
             raise HTTPException(
@@ -47,14 +64,13 @@ async def create_payment_link(
             customer_name=request.customer_name
         )
         
-        logger.info(
+        log.info(
             "Created payment link",
-            user_id=current_user["id"],
             tier=request.tier.value,
             payment_link_id=payment_link["id"]
         )
         
-        return PaymentLinkResponse(
+        response = PaymentLinkResponse(
             payment_link_id=payment_link["id"],
             payment_url=payment_link["short_url"],
             amount=payment_link["amount"] / 100,  # Convert from paise
@@ -62,9 +78,10 @@ async def create_payment_link(
             expires_at=payment_link.get("expire_by"),
             created_at=payment_link["created_at"]
         )
+        return ORJSONResponse(response.model_dump(mode="json"))
         
-    except Exception as e:
-        logger.error("Failed to create payment link", error=str(e), user_id=current_user["id"])
+    except Exception:
+        log.exception("Failed to create payment link")
         raise HTTPException(status_code=500, detail="Failed to create payment link")
 
 
@@ -75,6 +92,7 @@ async def upgrade_subscription(
     razorpay_service: RazorpayService = Depends(get_razorpay_service)
 ):
     """Initiate subscription upgrade process."""
+    log = logger.bind(user_id=current_user["id"])
     try:
         if request.target_tier == SubscriptionTier.FREE:
             raise HTTPException(
@@ -90,8 +108,8 @@ async def upgrade_subscription(
             "next_step": "create_payment_link"
         }
         
-    except Exception as e:
-        logger.error("Failed to upgrade subscription", error=str(e), user_id=current_user["id"])
+    except Exception:
+        log.exception("Failed to upgrade subscription")
         raise HTTPException(status_code=500, detail="Failed to process upgrade request")
 
 
@@ -103,9 +121,11 @@ async def cancel_subscription(
     subscription_repo = Depends(get_subscriptions_repository)
 ):
     """Cancel user subscription."""
+    user_id = current_user["id"]
+    log = logger.bind(user_id=user_id)
     try:
         # Get current subscription
-        subscription = await subscription_repo.get_by_user_id(current_user["id"])
+        subscription = await subscription_repo.get_by_user_id(user_id)
         if not subscription:
             raise HTTPException(status_code=404, detail="No active subscription found")
         
@@ -123,9 +143,8 @@ async def cancel_subscription(
             immediate=request.cancel_immediately
         )
         
-        logger.info(
+        log.info(
             "Cancelled subscription",
-            user_id=current_user["id"],
             subscription_id=subscription.id,
             immediate=request.cancel_immediately
         )
@@ -138,24 +157,26 @@ async def cancel_subscription(
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error("Failed to cancel subscription", error=str(e), user_id=current_user["id"])
+    except Exception:
+        log.exception("Failed to cancel subscription")
         raise HTTPException(status_code=500, detail="Failed to cancel subscription")
 
 
-@router.get("/subscription-details", response_model=SubscriptionDetails)
+@router.get("/subscription-details", responses={200: {"model": SubscriptionDetails}})
 async def get_subscription_details(
     current_user: dict = Depends(get_current_user),
     subscription_repo = Depends(get_subscriptions_repository)
 ):
     """Get detailed subscription information for current user."""
+    user_id = current_user["id"]
+    log = logger.bind(user_id=user_id)
     try:
-        subscription = await subscription_repo.get_by_user_id(current_user["id"])
+        subscription = await subscription_repo.get_by_user_id(user_id)
         if not subscription:
             raise HTTPException(status_code=404, detail="No subscription found")
         
         # Convert to detailed response model
-        return SubscriptionDetails(
+        details = SubscriptionDetails(
             id=subscription.id,
             user_id=subscription.user_id,
             tier=subscription.tier,
@@ -164,22 +185,23 @@ async def get_subscription_details(
             razorpay_customer_id=subscription.razorpay_customer_id,
             current_period_start=subscription.subscription_start_date,
             current_period_end=subscription.subscription_end_date,
-            amount=0 if subscription.tier == SubscriptionTier.FREE else 50 if subscription.tier == SubscriptionTier.PRO else 500,
+            amount=_TIER_PRICE[subscription.tier],
             api_key=subscription.api_key_hash,
             webhook_url=subscription.webhook_url,
             alert_thresholds=subscription.alert_thresholds,
             created_at=subscription.created_at,
             updated_at=subscription.updated_at
         )
+        return ORJSONResponse(details.model_dump(mode="json"))
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error("Failed to get subscription details", error=str(e), user_id=current_user["id"])
+    except Exception:
+        log.exception("Failed to get subscription details")
         raise HTTPException(status_code=500, detail="Failed to retrieve subscription details")
 
 
-@router.post("/webhook", response_model=WebhookProcessingResult)
+@router.post("/webhook", responses={200: {"model": WebhookProcessingResult}})
 async def razorpay_webhook(
     request: Request,
     background_tasks: BackgroundTasks,
@@ -187,19 +209,33 @@ async def razorpay_webhook(
 ):
     """Handle Razorpay webhook events."""
     try:
-        # Get raw body and signature
-        body = await request.body()
         signature = request.headers.get("X-Razorpay-Signature", "")
+        verifier = razorpay_service.webhook_verifier()
+        if verifier is None:
+            raise HTTPException(status_code=400, detail="Invalid signature")
+        
+        content_length = request.headers.get("content-length")
+        if content_length and content_length.isdigit() and int(content_length) > _MAX_WEBHOOK_BYTES:
+            raise HTTPException(status_code=413, detail="Webhook payload too large")
+        
+        # Read the body in chunks, hashing as it arrives and failing fast
+        # once it exceeds the size cap
+        body = bytearray()
+        async for chunk in request.stream():
+            if len(body) + len(chunk) > _MAX_WEBHOOK_BYTES:
+                raise HTTPException(status_code=413, detail="Webhook payload too large")
+            verifier.update(chunk)
+            body.extend(chunk)
         
         # Verify webhook signature
-        if not await razorpay_service.verify_webhook_signature(body, signature):
+        if not razorpay_service.webhook_signature_matches(verifier, signature):
             logger.warning("Invalid webhook signature")
             raise HTTPException(status_code=400, detail="Invalid signature")
         
         # Parse webhook data
         try:
-            webhook_data = json.loads(body.decode('utf-8'))
-        except json.JSONDecodeError:
+            webhook_data = orjson.loads(body)
+        except orjson.JSONDecodeError:
             logger.error("Invalid JSON in webhook payload")
             raise HTTPException(status_code=400, detail="Invalid JSON payload")
         
@@ -211,16 +247,17 @@ async def razorpay_webhook(
         )
         
         # Return immediate response
-        return WebhookProcessingResult(
+        result = WebhookProcessingResult(
             event_type=webhook_data.get("event", "unknown"),
             processed=True,
             action="queued_for_processing"
         )
+        return ORJSONResponse(result.model_dump(mode="json"))
         
     except HTTPException:
         raise
-    except Exception as e:
-        logger.error("Webhook processing failed", error=str(e))
+    except Exception:
+        logger.exception("Webhook processing failed")
         raise HTTPException(status_code=500, detail="Webhook processing failed")
 
 
@@ -240,27 +277,36 @@ async def process_webhook_background(
         # if result.get("user_id") and result.get("action"):
         #     await update_subscription_from_webhook(result)
         
-    except Exception as e:
-        logger.error("Background webhook processing failed", error=str(e))
+    except Exception:
+        logger.exception("Background webhook processing failed")
 
 
 @router.get("/plans")
-async def get_subscription_plans():
+async def get_subscription_plans(request: Request):
     """Get available subscription plans."""
-    from app.config import get_settings
-    settings = get_settings()
+    global _plans_body, _plans_etag
+    
+    # Plans come from settings, which are fixed for the process lifetime
+    if _plans_body is None:
+        settings = get_settings()
+        
+        plans = []
+        for tier_name, config in settings.subscription_tiers.items():
+            plans.append({
+                "tier": tier_name,
+                "name": f"ZERO-COMP {tier_name.title()}",
+                "price": _TIER_PRICE[tier_name],
+                "features": list(config["features"]),
+                "rate_limits": dict(config["rate_limits"])
+            })
+        
+        _plans_body = orjson.dumps({"plans": plans})
+        _plans_etag = f'"{hashlib.md5(_plans_body).hexdigest()}"'
     
-    plans = []
-    for tier_name, config in settings.subscription_tiers.items():
-        plans.append({
-            "tier": tier_name,
-            "name": f"ZERO-COMP {tier_name.title()}",
-            "price": config["price"],
-            "features": config["features"],
-            "rate_limits": config["rate_limits"]
-        })
+    if request.headers.get("if-none-match") == _plans_etag:
+        return Response(status_code=304, headers={"ETag": _plans_etag})
     
-    return {"plans": plans}
+    return Response(content=_plans_body, media_type="application/json", headers={"ETag": _plans_etag})
 
 
 @router.get("/health")
@@ -3,19 +3,37 @@ User Alert Configurations API
 CRUD operations for user-defined alert triggers
 """
 
-from typing import Optional, List
+from typing import Optional, List, Tuple
+from collections import OrderedDict
 from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field
+from uuid import UUID
 import structlog
-import uuid
+import time
 
-from app.services.supabase_client import get_supabase_client
+from app.services.database import DatabaseManager, get_database_manager
 from app.services.auth_service import get_current_user, UserSession
+from app.utils.responses import UTCJSONResponse
 
 logger = structlog.get_logger()
 
-router = APIRouter(prefix="/api/v1/user/alerts", tags=["User Alert Configurations"])
+# Per-user alert listings are cached briefly for dashboards that poll
+LIST_CACHE_TTL = 60.0
+LIST_CACHE_SIZE = 10_000
+
+# Accepted values, matching the table's CHECK constraints
+VALID_TRIGGER_SOURCES = frozenset({"flare_intensity", "kp_index", "solar_wind"})
+VALID_CONDITIONS = frozenset({"greater_than", "less_than", "equals"})
+_INVALID_SOURCE_DETAIL = "Invalid trigger_source. Must be one of: ['flare_intensity', 'kp_index', 'solar_wind']"
+_INVALID_CONDITION_DETAIL = "Invalid condition. Must be one of: ['greater_than', 'less_than', 'equals']"
+
+router = APIRouter(
+    prefix="/api/v1/user/alerts",
+    tags=["User Alert Configurations"],
+    default_response_class=ORJSONResponse
+)
 
 
 # ============== Pydantic Models ==============
@@ -54,8 +72,8 @@ class AlertConfigUpdate(BaseModel):
 
 class AlertConfigResponse(BaseModel):
     """Alert configuration response"""
-    id: str
-    user_id: str
+    id: UUID
+    user_id: UUID
     name: str
     trigger_source: str
     condition: str
@@ -79,39 +97,75 @@ class AlertConfigListResponse(BaseModel):
 # ============== Repository ==============
 
 class UserAlertConfigRepository:
-    """Database operations for user alert configurations"""
+    """
+    Database operations for user alert configurations
+    
+    Queries filter on user_id as well as id: the pooled connection's role
+    bypasses row-level security, so ownership is enforced here
+    """
     
     def __init__(self):
-        self.supabase = get_supabase_client()
         self.table = "user_alert_configs"
+        self.db_manager: Optional[DatabaseManager] = None
+        # user_id -> (expires_at, rows), least recently used first
+        self._list_cache: "OrderedDict[str, Tuple[float, List[dict]]]" = OrderedDict()
+        # Bumped on every write so an in-flight read can't cache stale rows
+        self._generation = 0
+    
+    async def _get_db_manager(self) -> DatabaseManager:
+        """Get database manager instance"""
+        if not self.db_manager:
+            self.db_manager = await get_database_manager()
+        return self.db_manager
+    
+    def _invalidate(self, user_id: str) -> None:
+        """Drop the cached listing for a user after a write"""
+        self._list_cache.pop(user_id, None)
+        self._generation += 1
+    
+    @staticmethod
+    def _row_to_dict(row: dict) -> dict:
+        """Convert the DECIMAL threshold to the response model's float"""
+        row["threshold"] = float(row["threshold"])
+        return row
     
     async def create(self, user_id: str, config: AlertConfigCreate) -> dict:
         """Create a new alert configuration"""
         try:
-            data = {
-                "id": str(uuid.uuid4()),
-                "user_id": user_id,
-                "name": config.name,
-                "trigger_source": config.trigger_source,
-                "condition": config.condition,
-                "threshold": config.threshold,
-                "delivery_channels": config.delivery_channels.model_dump(),
-                "webhook_url": config.webhook_url,
-                "webhook_payload": config.webhook_payload,
-                "is_active": config.is_active,
-                "triggered_count": 0,
-                "created_at": datetime.utcnow().isoformat(),
-                "updated_at": datetime.utcnow().isoformat()
-            }
+            db_manager = await self._get_db_manager()
             
-            result = self.supabase.client.table(self.table).insert(data).execute()
+            query = f"""
+                INSERT INTO {self.table} (
+                    user_id, name, trigger_source, condition, threshold,
+                    delivery_channels, webhook_url, webhook_payload, is_active
+                )
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9)
+                RETURNING *
+            """
             
-            if result.data:
-                logger.info("alert_config_created", user_id=user_id, alert_id=data["id"])
-                return result.data[0]
+            row = await db_manager.execute_query(
+                query,
+                user_id,
+                config.name,
+                config.trigger_source,
+                config.condition,
+                config.threshold,
+                config.delivery_channels.model_dump(),
+                config.webhook_url,
+                config.webhook_payload,
+                config.is_active,
+                fetch_one=True
+            )
+            
+            if row:
+                self._invalidate(user_id)
+                logger.info("alert_config_created", user_id=user_id, alert_id=str(row["id"]))
+                return self._row_to_dict(row)
             
             raise HTTPException(status_code=500, detail="Failed to create alert configuration")
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error("alert_config_create_failed", error=str(e))
             raise HTTPException(status_code=500, detail=str(e))
@@ -119,14 +173,12 @@ class UserAlertConfigRepository:
     async def get_by_id(self, user_id: str, alert_id: str) -> Optional[dict]:
         """Get a specific alert configuration"""
         try:
-            result = self.supabase.client.table(self.table)\
-                .select("*")\
-                .eq("id", alert_id)\
-                .eq("user_id", user_id)\
-                .single()\
-                .execute()
+            db_manager = await self._get_db_manager()
+            
+            query = f"SELECT * FROM {self.table} WHERE id = $1 AND user_id = $2"
+            row = await db_manager.execute_query(query, alert_id, user_id, fetch_one=True)
             
-            return result.data if result.data else None
+            return self._row_to_dict(row) if row else None
             
         except Exception as e:
             logger.error("alert_config_get_failed", error=str(e))
@@ -134,14 +186,27 @@ class UserAlertConfigRepository:
     
     async def get_all(self, user_id: str) -> List[dict]:
         """Get all alert configurations for a user"""
+        now = time.monotonic()
+        cached = self._list_cache.get(user_id)
+        if cached is not None and cached[0] > now:
+            self._list_cache.move_to_end(user_id)
+            return cached[1]
+        
         try:
-            result = self.supabase.client.table(self.table)\
-                .select("*")\
-                .eq("user_id", user_id)\
-                .order("created_at", desc=True)\
-                .execute()
+            db_manager = await self._get_db_manager()
+            generation = self._generation
+            
+            query = f"SELECT * FROM {self.table} WHERE user_id = $1 ORDER BY created_at DESC"
+            rows = await db_manager.execute_query(query, user_id, fetch_all=True)
+            alerts = [self._row_to_dict(row) for row in rows]
+            
+            if generation == self._generation:
+                self._list_cache[user_id] = (now + LIST_CACHE_TTL, alerts)
+                self._list_cache.move_to_end(user_id)
+                if len(self._list_cache) > LIST_CACHE_SIZE:
+                    self._list_cache.popitem(last=False)
             
-            return result.data or []
+            return alerts
             
         except Exception as e:
             logger.error("alert_configs_get_failed", error=str(e))
@@ -150,35 +215,37 @@ class UserAlertConfigRepository:
     async def update(self, user_id: str, alert_id: str, config: AlertConfigUpdate) -> Optional[dict]:
         """Update an alert configuration"""
         try:
-            # Build update data (only non-None fields)
-            update_data = {"updated_at": datetime.utcnow().isoformat()}
+            db_manager = await self._get_db_manager()
             
-            if config.name is not None:
-                update_data["name"] = config.name
-            if config.trigger_source is not None:
-                update_data["trigger_source"] = config.trigger_source
-            if config.condition is not None:
-                update_data["condition"] = config.condition
-            if config.threshold is not None:
-                update_data["threshold"] = config.threshold
+            # Only fields the client sent are dumped; nulls are still skipped.
+            # delivery_channels is written whole, so it is dumped without
+            # exclude_unset. Field names match the columns.
+            update_data = config.model_dump(
+                include=config.model_fields_set - {"delivery_channels"},
+                exclude_none=True
+            )
             if config.delivery_channels is not None:
                 update_data["delivery_channels"] = config.delivery_channels.model_dump()
-            if config.webhook_url is not None:
-                update_data["webhook_url"] = config.webhook_url
-            if config.webhook_payload is not None:
-                update_data["webhook_payload"] = config.webhook_payload
-            if config.is_active is not None:
-                update_data["is_active"] = config.is_active
             
-            result = self.supabase.client.table(self.table)\
-                .update(update_data)\
-                .eq("id", alert_id)\
-                .eq("user_id", user_id)\
-                .execute()
+            set_clauses = ["updated_at = NOW()"]
+            values = [alert_id, user_id]
+            for field, value in update_data.items():
+                values.append(value)
+                set_clauses.append(f"{field} = ${len(values)}")
             
-            if result.data:
+            query = f"""
+                UPDATE {self.table}
+                SET {', '.join(set_clauses)}
+                WHERE id = $1 AND user_id = $2
+                RETURNING *
+            """
+            
+            row = await db_manager.execute_query(query, *values, fetch_one=True)
+            
+            if row:
+                self._invalidate(user_id)
                 logger.info("alert_config_updated", user_id=user_id, alert_id=alert_id)
-                return result.data[0]
+                return self._row_to_dict(row)
             
             return None
             
@@ -189,13 +256,15 @@ class UserAlertConfigRepository:
     async def delete(self, user_id: str, alert_id: str) -> bool:
         """Delete an alert configuration"""
         try:
-            result = self.supabase.client.table(self.table)\
-                .delete()\
-                .eq("id", alert_id)\
-                .eq("user_id", user_id)\
-                .execute()
+            db_manager = await self._get_db_manager()
             
-            if result.data:
+            # The command status ("DELETE <count>") says whether a row
+            # matched, so no row needs to come back
+            query = f"DELETE FROM {self.table} WHERE id = $1 AND user_id = $2"
+            result = await db_manager.execute_query(query, alert_id, user_id)
+            
+            if result != "DELETE 0":
+                self._invalidate(user_id)
                 logger.info("alert_config_deleted", user_id=user_id, alert_id=alert_id)
                 return True
             
@@ -208,25 +277,22 @@ class UserAlertConfigRepository:
     async def toggle_active(self, user_id: str, alert_id: str) -> Optional[dict]:
         """Toggle alert active status"""
         try:
-            # Get current state
-            current = await self.get_by_id(user_id, alert_id)
-            if not current:
-                return None
+            db_manager = await self._get_db_manager()
             
-            new_state = not current.get("is_active", True)
+            # Flip the flag in place rather than reading it first
+            query = f"""
+                UPDATE {self.table}
+                SET is_active = NOT is_active, updated_at = NOW()
+                WHERE id = $1 AND user_id = $2
+                RETURNING *
+            """
             
-            result = self.supabase.client.table(self.table)\
-                .update({
-                    "is_active": new_state,
-                    "updated_at": datetime.utcnow().isoformat()
-                })\
-                .eq("id", alert_id)\
-                .eq("user_id", user_id)\
-                .execute()
+            row = await db_manager.execute_query(query, alert_id, user_id, fetch_one=True)
             
-            if result.data:
-                logger.info("alert_config_toggled", alert_id=alert_id, is_active=new_state)
-                return result.data[0]
+            if row:
+                self._invalidate(user_id)
+                logger.info("alert_config_toggled", alert_id=alert_id, is_active=row["is_active"])
+                return self._row_to_dict(row)
             
             return None
             
@@ -247,7 +313,10 @@ def get_alert_repo() -> UserAlertConfigRepository:
 
 # ============== API Endpoints ==============
 
-@router.get("", response_model=AlertConfigListResponse)
+# Repository rows are already in the AlertConfigResponse shape, so handlers
+# return them through orjson directly; the models document the schema
+
+@router.get("", responses={200: {"model": AlertConfigListResponse}})
 async def list_user_alerts(
     user: UserSession = Depends(get_current_user),
     repo: UserAlertConfigRepository = Depends(get_alert_repo)
@@ -259,13 +328,17 @@ async def list_user_alerts(
     """
     alerts = await repo.get_all(user.user_id)
     
-    return AlertConfigListResponse(
-        alerts=[AlertConfigResponse(**a) for a in alerts],
-        total=len(alerts)
-    )
+    return UTCJSONResponse({
+        "alerts": alerts,
+        "total": len(alerts)
+    })
 
 
-@router.post("", response_model=AlertConfigResponse, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "",
+    status_code=status.HTTP_201_CREATED,
+    responses={201: {"model": AlertConfigResponse}}
+)
 async def create_user_alert(
     config: AlertConfigCreate,
     user: UserSession = Depends(get_current_user),
@@ -286,26 +359,24 @@ async def create_user_alert(
     - Slack: (Coming soon)
     """
     # Validate trigger source
-    valid_sources = ["flare_intensity", "kp_index", "solar_wind"]
-    if config.trigger_source not in valid_sources:
+    if config.trigger_source not in VALID_TRIGGER_SOURCES:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid trigger_source. Must be one of: {valid_sources}"
+            detail=_INVALID_SOURCE_DETAIL
         )
     
     # Validate condition
-    valid_conditions = ["greater_than", "less_than", "equals"]
-    if config.condition not in valid_conditions:
+    if config.condition not in VALID_CONDITIONS:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid condition. Must be one of: {valid_conditions}"
+            detail=_INVALID_CONDITION_DETAIL
         )
     
     alert = await repo.create(user.user_id, config)
-    return AlertConfigResponse(**alert)
+    return UTCJSONResponse(alert, status_code=status.HTTP_201_CREATED)
 
 
-@router.get("/{alert_id}", response_model=AlertConfigResponse)
+@router.get("/{alert_id}", responses={200: {"model": AlertConfigResponse}})
 async def get_user_alert(
     alert_id: str,
     user: UserSession = Depends(get_current_user),
@@ -317,10 +388,10 @@ async def get_user_alert(
     if not alert:
         raise HTTPException(status_code=404, detail="Alert configuration not found")
     
-    return AlertConfigResponse(**alert)
+    return UTCJSONResponse(alert)
 
 
-@router.patch("/{alert_id}", response_model=AlertConfigResponse)
+@router.patch("/{alert_id}", responses={200: {"model": AlertConfigResponse}})
 async def update_user_alert(
     alert_id: str,
     config: AlertConfigUpdate,
@@ -329,22 +400,18 @@ async def update_user_alert(
 ):
     """Update an existing alert configuration."""
     # Validate if provided
-    if config.trigger_source:
-        valid_sources = ["flare_intensity", "kp_index", "solar_wind"]
-        if config.trigger_source not in valid_sources:
-            raise HTTPException(status_code=400, detail=f"Invalid trigger_source")
+    if config.trigger_source and config.trigger_source not in VALID_TRIGGER_SOURCES:
+        raise HTTPException(status_code=400, detail="Invalid trigger_source")
     
-    if config.condition:
-        valid_conditions = ["greater_than", "less_than", "equals"]
-        if config.condition not in valid_conditions:
-            raise HTTPException(status_code=400, detail=f"Invalid condition")
+    if config.condition and config.condition not in VALID_CONDITIONS:
+        raise HTTPException(status_code=400, detail="Invalid condition")
     
     alert = await repo.update(user.user_id, alert_id, config)
     
     if not alert:
         raise HTTPException(status_code=404, detail="Alert configuration not found")
     
-    return AlertConfigResponse(**alert)
+    return UTCJSONResponse(alert)
 
 
 @router.delete("/{alert_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -362,7 +429,7 @@ async def delete_user_alert(
     return None
 
 
-@router.post("/{alert_id}/toggle", response_model=AlertConfigResponse)
+@router.post("/{alert_id}/toggle", responses={200: {"model": AlertConfigResponse}})
 async def toggle_user_alert(
     alert_id: str,
     user: UserSession = Depends(get_current_user),
@@ -374,4 +441,4 @@ async def toggle_user_alert(
     if not alert:
         raise HTTPException(status_code=404, detail="Alert configuration not found")
     
-    return AlertConfigResponse(**alert)
+    return UTCJSONResponse(alert)
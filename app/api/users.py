@@ -8,26 +8,38 @@ from pydantic import BaseModel, EmailStr
 import secrets
 import hashlib
 import logging
+import re
 
 from app.models.core import (
     UserSubscription,
     SubscriptionTier,
     ErrorResponse
 )
-from app.services.auth_service import get_auth_service, UserSession, get_current_user
-from app.repositories.subscriptions import get_subscriptions_repository
-from app.repositories.api_usage import get_api_usage_repository
+from app.services.auth_service import UserSession, get_current_user
+from app.repositories.subscriptions import get_subscriptions_repository, SubscriptionsRepository
 from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/users", tags=["Users"])
 security = HTTPBearer()
-auth_service = get_auth_service()
-subscriptions_repo = get_subscriptions_repository()
-api_usage_repo = get_api_usage_repository()
 settings = get_settings()
 
+# Rate limits and features per tier; settings are fixed for the process
+_TIER_LIMITS = {
+    tier: (config.get("rate_limits", {}), config.get("features", []))
+    for tier, config in settings.subscription_tiers.items()
+}
+_NO_TIER_LIMITS = ({}, [])
+
+# Webhook URLs must be https with only URL-safe characters
+_WEBHOOK_URL_RE = re.compile(r"https://[A-Za-z0-9\-._~:/?#\[\]@!$&'()*+,;=%]+")
+
+
+async def get_subscriptions_repo() -> SubscriptionsRepository:
+    """Subscriptions repository dependency."""
+    return get_subscriptions_repository()
+
 
 # Request/Response Models
 class UserProfileResponse(BaseModel):
@@ -79,7 +91,8 @@ class UsageStatsResponse(BaseModel):
 )
 async def get_user_profile(
     request: Request,
-    user_session: UserSession = Depends(get_current_user)
+    user_session: UserSession = Depends(get_current_user),
+    subscriptions_repo: SubscriptionsRepository = Depends(get_subscriptions_repo)
 ) -> UserProfileResponse:
     """
     Get the current user's profile information.
@@ -90,17 +103,17 @@ async def get_user_profile(
     **Authentication Required**: Bearer token (JWT or API key)
     """
     try:
-        # Get user subscription details
-        subscription = await subscriptions_repo.get_by_user_id(user_session.user_id)
+        # Get user subscription details, creating a default free-tier
+        # subscription in the same query if none exists
+        bundle = await subscriptions_repo.get_profile_bundle(
+            user_session.user_id,
+            default_thresholds=dict(settings.default_alert_thresholds)
+        )
         
-        if not subscription:
-            # Create default subscription if not exists
-            subscription = UserSubscription(
-                user_id=user_session.user_id,
-                tier=SubscriptionTier.FREE,
-                alert_thresholds=settings.default_alert_thresholds
-            )
-            subscription = await subscriptions_repo.create(subscription)
+        if not bundle:
+            raise RuntimeError("Subscription lookup failed")
+        
+        subscription, _ = bundle
         
         return UserProfileResponse(
             user_id=user_session.user_id,
@@ -131,13 +144,15 @@ async def get_user_profile(
 )
 async def update_user_profile(
     request: UpdateProfileRequest,
-    user_session: UserSession = Depends(get_current_user)
+    user_session: UserSession = Depends(get_current_user),
+    subscriptions_repo: SubscriptionsRepository = Depends(get_subscriptions_repo)
 ) -> UserProfileResponse:
     """
     Update the current user's profile settings.
     
     **Updatable Fields**:
-    - `webhook_url`: URL for webhook notifications (Pro/Enterprise only)
+    - `webhook_url`: https:// URL for webhook notifications (Pro/Enterprise
+      only); an empty string removes the webhook
     - `alert_thresholds`: Custom alert probability thresholds
     
     **Authentication Required**: Bearer token (JWT or API key)
@@ -158,6 +173,12 @@ async def update_user_profile(
                     status_code=403,
                     detail="Webhook URLs require Pro or Enterprise subscription"
                 )
+            # "" clears the webhook; None can't, since update() drops None values
+            if request.webhook_url and not _WEBHOOK_URL_RE.fullmatch(request.webhook_url):
+                raise HTTPException(
+                    status_code=400,
+                    detail="Webhook URL must be a valid https:// URL"
+                )
         
         # Update fields
         updates = {}
@@ -213,7 +234,8 @@ async def update_user_profile(
     description="Generate a new API key for programmatic access."
 )
 async def generate_api_key(
-    user_session: UserSession = Depends(get_current_user)
+    user_session: UserSession = Depends(get_current_user),
+    subscriptions_repo: SubscriptionsRepository = Depends(get_subscriptions_repo)
 ) -> APIKeyResponse:
     """
     Generate a new API key for the current user.
@@ -246,10 +268,9 @@ async def generate_api_key(
         api_key = f"zc_{secrets.token_urlsafe(32)}"
         api_key_hash = hashlib.sha256(api_key.encode()).hexdigest()
         
-        # Update subscription with new API key hash
+        # Update subscription with new API key hash (update() stamps updated_at)
         await subscriptions_repo.update(subscription.id, {
-            'api_key_hash': api_key_hash,
-            'updated_at': datetime.utcnow()
+            'api_key_hash': api_key_hash
         })
         
         logger.info(f"API key generated for user: {user_session.user_id}")
@@ -275,7 +296,8 @@ async def generate_api_key(
     description="Revoke the current user's API key."
 )
 async def revoke_api_key(
-    user_session: UserSession = Depends(get_current_user)
+    user_session: UserSession = Depends(get_current_user),
+    subscriptions_repo: SubscriptionsRepository = Depends(get_subscriptions_repo)
 ):
     """
     Revoke the current user's API key.
@@ -300,10 +322,9 @@ async def revoke_api_key(
                 detail="No API key found to revoke"
             )
         
-        # Remove API key hash
+        # Remove API key hash (update() stamps updated_at)
         await subscriptions_repo.update(subscription.id, {
-            'api_key_hash': None,
-            'updated_at': datetime.utcnow()
+            'api_key_hash': None
         })
         
         logger.info(f"API key revoked for user: {user_session.user_id}")
@@ -328,7 +349,8 @@ async def revoke_api_key(
 )
 async def get_usage_statistics(
     hours_back: int = 24,
-    user_session: UserSession = Depends(get_current_user)
+    user_session: UserSession = Depends(get_current_user),
+    subscriptions_repo: SubscriptionsRepository = Depends(get_subscriptions_repo)
 ) -> UsageStatsResponse:
     """
     Get usage statistics for the current user.
@@ -344,24 +366,22 @@ async def get_usage_statistics(
     **Authentication Required**: Bearer token (JWT or API key)
     """
     try:
-        subscription = await subscriptions_repo.get_by_user_id(user_session.user_id)
+        # Subscription and usage statistics come back in one query
+        bundle = await subscriptions_repo.get_profile_bundle(
+            user_session.user_id,
+            hours_back
+        )
         
-        if not subscription:
+        if not bundle:
             raise HTTPException(
                 status_code=404,
                 detail="User subscription not found"
             )
         
-        # Get usage statistics
-        usage_stats = await api_usage_repo.get_user_statistics(
-            user_session.user_id, 
-            hours_back
-        )
+        subscription, usage_stats = bundle
         
         # Get tier configuration
-        tier_config = settings.subscription_tiers.get(subscription.tier.value, {})
-        rate_limits = tier_config.get("rate_limits", {})
-        features = tier_config.get("features", [])
+        rate_limits, features = _TIER_LIMITS.get(subscription.tier.value, _NO_TIER_LIMITS)
         
         return UsageStatsResponse(
             current_period=usage_stats,
@@ -387,7 +407,8 @@ async def get_usage_statistics(
     description="Get detailed subscription information."
 )
 async def get_subscription_details(
-    user_session: UserSession = Depends(get_current_user)
+    user_session: UserSession = Depends(get_current_user),
+    subscriptions_repo: SubscriptionsRepository = Depends(get_subscriptions_repo)
 ) -> UserSubscription:
     """
     Get detailed subscription information for the current user.
@@ -423,7 +444,8 @@ async def get_subscription_details(
 )
 async def update_subscription(
     request: SubscriptionUpdateRequest,
-    user_session: UserSession = Depends(get_current_user)
+    user_session: UserSession = Depends(get_current_user),
+    subscriptions_repo: SubscriptionsRepository = Depends(get_subscriptions_repo)
 ) -> UserSubscription:
     """
     Update user subscription tier.
@@ -446,7 +468,8 @@ async def update_subscription(
         updated_subscription = await subscriptions_repo.update_subscription_tier(
             user_session.user_id,
             request.tier,
-            request.razorpay_subscription_id
+            request.razorpay_subscription_id,
+            subscription=subscription
         )
         
         if not updated_subscription:
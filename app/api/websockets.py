@@ -1,14 +1,14 @@
 """WebSocket API endpoints for real-time alerts."""
 
 import logging
+from datetime import datetime
 from typing import Optional
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Query, Depends, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
-from app.services.websocket_manager import get_websocket_manager, WebSocketManager
+from app.services.websocket_manager import get_websocket_manager, WebSocketManager, frame_template
 from app.services.auth_service import get_auth_service, AuthService, get_current_user
-from app.models.core import WebSocketMessage
 from app.middleware.subscription import require_websocket_access, get_api_key_subscription
 
 logger = logging.getLogger(__name__)
@@ -16,6 +16,9 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/ws", tags=["WebSocket"])
 security = HTTPBearer(auto_error=False)
 
+# Sent whenever handling a client message fails, so serialize it once
+_GENERIC_ERROR_FRAME = frame_template("error", {"message": "Error processing message"})
+
 
 @router.websocket("/alerts")
 async def websocket_alerts_endpoint(
@@ -29,6 +32,14 @@ async def websocket_alerts_endpoint(
     Query Parameters:
     - token: Optional JWT token for authentication
     
+    Clients that request the "zerocomp.msgpack.v1" subprotocol may send
+    msgpack-encoded binary frames instead of JSON text. Server messages
+    are always JSON text, one message object per frame.
+    
+    Clients that request the "zerocomp.batch.v1" subprotocol instead may
+    receive messages queued while an earlier send was in flight together
+    as a single JSON array frame.
+    
     Message Types (Client -> Server):
     - heartbeat: Keep connection alive
     - authenticate: Authenticate with JWT token
@@ -58,9 +69,15 @@ async def websocket_alerts_endpoint(
         # Listen for messages
         while True:
             try:
-                # Receive message from client
-                message = await websocket.receive_text()
-                await ws_manager.handle_message(connection_id, message)
+                # Receive message from client; msgpack clients send binary frames
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    raise WebSocketDisconnect(message.get("code", 1000))
+                
+                if message.get("bytes") is not None:
+                    await ws_manager.handle_message_binary(connection_id, message["bytes"])
+                else:
+                    await ws_manager.handle_message(connection_id, message["text"])
                 
             except WebSocketDisconnect:
                 logger.info(f"WebSocket client disconnected: {connection_id}")
@@ -68,13 +85,8 @@ async def websocket_alerts_endpoint(
             except Exception as e:
                 logger.error(f"Error handling WebSocket message: {e}")
                 # Send error message to client
-                error_msg = WebSocketMessage(
-                    type="error",
-                    data={"message": "Error processing message"}
-                )
-                try:
-                    await websocket.send_text(error_msg.model_dump_json())
-                except:
+                error_frame = _GENERIC_ERROR_FRAME % datetime.utcnow().isoformat()
+                if not await ws_manager.send_text(connection_id, error_frame):
                     break
     
     except Exception as e:
@@ -145,7 +157,9 @@ async def broadcast_test_alert(
         "test": True
     }
     
-    await ws_manager.broadcast_alert(test_alert_data, SeverityLevel.HIGH)
+    # Serialize once; every client is sent the same string
+    payload = ws_manager.build_alert_payload(test_alert_data, SeverityLevel.HIGH)
+    await ws_manager.broadcast_raw(payload, SeverityLevel.HIGH, test_alert_data["flare_probability"])
     
     return {
         "success": True,
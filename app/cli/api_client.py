@@ -6,19 +6,42 @@ A command-line interface for testing and interacting with the ZERO-COMP Solar We
 """
 
 import asyncio
+import functools
 import json
+import os
+import shlex
 import sys
+import time
 import argparse
-from typing import Optional, Dict, Any
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any, TYPE_CHECKING
 from datetime import datetime, timedelta
-import aiohttp
-import websockets
 from pathlib import Path
 
+# httpx and websockets are imported where they are used, so commands that
+# never touch the network (config, --help) start faster
+if TYPE_CHECKING:
+    import httpx
+
+# orjson is much faster at parsing frames and formatting output; fall back
+# to the stdlib when it isn't installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Configuration
 DEFAULT_BASE_URL = "https://api.zero-comp.com"
 DEFAULT_WS_URL = "wss://api.zero-comp.com/ws/alerts"
 
+# Read size when streaming CSV exports to disk
+CSV_CHUNK_SIZE = 1 << 16
+
+# WebSocket subprotocol under which the server may batch messages into
+# one JSON array frame
+WS_BATCH_SUBPROTOCOL = "zerocomp.batch.v1"
+
 
 class ZeroCompAPIClient:
     """ZERO-COMP API client for CLI operations."""
@@ -26,33 +49,43 @@ class ZeroCompAPIClient:
     def __init__(self, base_url: str = DEFAULT_BASE_URL, api_key: Optional[str] = None):
         self.base_url = base_url.rstrip('/')
         self.api_key = api_key
-        self.session: Optional[aiohttp.ClientSession] = None
+        self.session: Optional["httpx.AsyncClient"] = None
     
     async def __aenter__(self):
         """Async context manager entry."""
+        import httpx
+        
         headers = {}
         if self.api_key:
             headers['Authorization'] = f'Bearer {self.api_key}'
         
-        self.session = aiohttp.ClientSession(
+        # HTTP/2 multiplexes concurrent requests over one TLS connection
+        self.session = httpx.AsyncClient(
+            base_url=self.base_url,
             headers=headers,
-            timeout=aiohttp.ClientTimeout(total=30)
+            timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(max_connections=20)
         )
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Async context manager exit."""
         if self.session:
-            await self.session.close()
+            await self.session.aclose()
+    
+    @staticmethod
+    def _json_or_raise(response: "httpx.Response") -> Dict[str, Any]:
+        """Return the JSON body of a successful response, or raise with the API's error message."""
+        if response.status_code == 200:
+            return response.json()
+        error = response.json()
+        raise Exception(f"API Error {response.status_code}: {error.get('message', 'Unknown error')}")
     
     async def get_current_alert(self) -> Dict[str, Any]:
         """Get current solar flare alert."""
-        async with self.session.get(f"{self.base_url}/api/v1/alerts/current") as response:
-            if response.status == 200:
-                return await response.json()
-            else:
-                error = await response.json()
-                raise Exception(f"API Error {response.status}: {error.get('message', 'Unknown error')}")
+        response = await self.session.get("/api/v1/alerts/current")
+        return self._json_or_raise(response)
     
     async def get_alert_history(
         self,
@@ -74,23 +107,15 @@ class ZeroCompAPIClient:
         if min_probability is not None:
             params['min_probability'] = min_probability
         
-        async with self.session.get(f"{self.base_url}/api/v1/alerts/history", params=params) as response:
-            if response.status == 200:
-                return await response.json()
-            else:
-                error = await response.json()
-                raise Exception(f"API Error {response.status}: {error.get('message', 'Unknown error')}")
+        response = await self.session.get("/api/v1/alerts/history", params=params)
+        return self._json_or_raise(response)
     
     async def get_alert_statistics(self, hours_back: int = 24) -> Dict[str, Any]:
         """Get alert statistics."""
         params = {'hours_back': hours_back}
         
-        async with self.session.get(f"{self.base_url}/api/v1/alerts/statistics", params=params) as response:
-            if response.status == 200:
-                return await response.json()
-            else:
-                error = await response.json()
-                raise Exception(f"API Error {response.status}: {error.get('message', 'Unknown error')}")
+        response = await self.session.get("/api/v1/alerts/statistics", params=params)
+        return self._json_or_raise(response)
     
     async def export_csv(
         self,
@@ -107,53 +132,39 @@ class ZeroCompAPIClient:
         if min_probability is not None:
             params['min_probability'] = min_probability
         
-        async with self.session.get(f"{self.base_url}/api/v1/alerts/export/csv", params=params) as response:
-            if response.status == 200:
-                content = await response.read()
+        # Stream to disk so large exports aren't held in memory
+        async with self.session.stream("GET", "/api/v1/alerts/export/csv", params=params) as response:
+            if response.status_code == 200:
                 with open(output_file, 'wb') as f:
-                    f.write(content)
+                    async for chunk in response.aiter_bytes(CSV_CHUNK_SIZE):
+                        f.write(chunk)
                 return output_file
             else:
-                error = await response.json()
-                raise Exception(f"API Error {response.status}: {error.get('message', 'Unknown error')}")
+                await response.aread()
+                error = response.json()
+                raise Exception(f"API Error {response.status_code}: {error.get('message', 'Unknown error')}")
     
     async def get_user_profile(self) -> Dict[str, Any]:
         """Get user profile information."""
-        async with self.session.get(f"{self.base_url}/api/v1/users/profile") as response:
-            if response.status == 200:
-                return await response.json()
-            else:
-                error = await response.json()
-                raise Exception(f"API Error {response.status}: {error.get('message', 'Unknown error')}")
+        response = await self.session.get("/api/v1/users/profile")
+        return self._json_or_raise(response)
     
     async def generate_api_key(self) -> Dict[str, Any]:
         """Generate a new API key."""
-        async with self.session.post(f"{self.base_url}/api/v1/users/api-key") as response:
-            if response.status == 200:
-                return await response.json()
-            else:
-                error = await response.json()
-                raise Exception(f"API Error {response.status}: {error.get('message', 'Unknown error')}")
+        response = await self.session.post("/api/v1/users/api-key")
+        return self._json_or_raise(response)
     
     async def get_usage_stats(self, hours_back: int = 24) -> Dict[str, Any]:
         """Get usage statistics."""
         params = {'hours_back': hours_back}
         
-        async with self.session.get(f"{self.base_url}/api/v1/users/usage", params=params) as response:
-            if response.status == 200:
-                return await response.json()
-            else:
-                error = await response.json()
-                raise Exception(f"API Error {response.status}: {error.get('message', 'Unknown error')}")
+        response = await self.session.get("/api/v1/users/usage", params=params)
+        return self._json_or_raise(response)
     
     async def health_check(self) -> Dict[str, Any]:
         """Check API health."""
-        async with self.session.get(f"{self.base_url}/health") as response:
-            if response.status == 200:
-                return await response.json()
-            else:
-                error = await response.json()
-                raise Exception(f"API Error {response.status}: {error.get('message', 'Unknown error')}")
+        response = await self.session.get("/health")
+        return self._json_or_raise(response)
 
 
 class WebSocketClient:
@@ -165,23 +176,27 @@ class WebSocketClient:
     
     async def connect_and_listen(self, duration: Optional[int] = None):
         """Connect to WebSocket and listen for alerts."""
+        import websockets
+        
         uri = f"{self.ws_url}?token={self.token}" if self.token else self.ws_url
         
         print(f"Connecting to {uri}")
         
         try:
-            async with websockets.connect(uri) as websocket:
+            async with websockets.connect(uri, subprotocols=[WS_BATCH_SUBPROTOCOL]) as websocket:
                 print("✅ Connected to ZERO-COMP WebSocket")
                 
-                start_time = datetime.now()
+                start_time = time.monotonic()
                 
                 async for message in websocket:
                     try:
-                        data = json.loads(message)
-                        await self._handle_message(data)
+                        data = orjson.loads(message) if ORJSON_AVAILABLE else json.loads(message)
+                        # Bursts arrive batched as an array in a single frame
+                        for item in data if isinstance(data, list) else [data]:
+                            await self._handle_message(item)
                         
                         # Check duration limit
-                        if duration and (datetime.now() - start_time).seconds >= duration:
+                        if duration and time.monotonic() - start_time >= duration:
                             print(f"\n⏰ Duration limit reached ({duration}s), disconnecting...")
                             break
                             
@@ -199,7 +214,8 @@ class WebSocketClient:
     async def _handle_message(self, data: Dict[str, Any]):
         """Handle incoming WebSocket message."""
         msg_type = data.get('type', 'unknown')
-        timestamp = data.get('timestamp', datetime.now().isoformat())
+        # Server messages carry a timestamp; only build one when it's missing
+        timestamp = data.get('timestamp') or datetime.now().isoformat()
         
         if msg_type == 'connection':
             print(f"🔗 [{timestamp}] Connection confirmed: {data.get('data', {}).get('message', '')}")
@@ -225,7 +241,22 @@ class WebSocketClient:
             print(f"❌ [{timestamp}] Error: {error_data.get('message', 'Unknown error')}")
         
         else:
-            print(f"📨 [{timestamp}] {msg_type.upper()}: {json.dumps(data.get('data', {}), indent=2)}")
+            print(f"📨 [{timestamp}] {msg_type.upper()}: {format_json_output(data.get('data', {}))}")
+
+
+@functools.lru_cache(maxsize=1)
+def _read_config_file() -> Dict[str, Any]:
+    """Read the config file once per process; save_config clears the cache."""
+    config_file = Path.home() / '.zerocomp' / 'config.json'
+    if not config_file.exists():
+        return {}
+    
+    try:
+        raw = config_file.read_bytes()
+        return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+    except Exception as e:
+        print(f"Warning: Could not load config file: {e}")
+        return {}
 
 
 def load_config() -> Dict[str, Any]:
@@ -236,18 +267,10 @@ def load_config() -> Dict[str, Any]:
         'api_key': None
     }
     
-    # Try to load from config file
-    config_file = Path.home() / '.zerocomp' / 'config.json'
-    if config_file.exists():
-        try:
-            with open(config_file) as f:
-                file_config = json.load(f)
-                config.update(file_config)
-        except Exception as e:
-            print(f"Warning: Could not load config file: {e}")
+    # Load from config file
+    config.update(_read_config_file())
     
     # Override with environment variables
-    import os
     if os.getenv('ZEROCOMP_API_KEY'):
         config['api_key'] = os.getenv('ZEROCOMP_API_KEY')
     if os.getenv('ZEROCOMP_BASE_URL'):
@@ -261,23 +284,47 @@ def save_config(config: Dict[str, Any]):
     config_dir = Path.home() / '.zerocomp'
     config_dir.mkdir(exist_ok=True)
     
+    # Write to a temp file and swap it in, so an interrupted save can't
+    # leave a truncated config behind
     config_file = config_dir / 'config.json'
-    with open(config_file, 'w') as f:
+    tmp_file = config_file.with_suffix('.tmp')
+    with open(tmp_file, 'w') as f:
         json.dump(config, f, indent=2)
+    os.replace(tmp_file, config_file)
+    _read_config_file.cache_clear()
     
     print(f"Configuration saved to {config_file}")
 
 
+# Client shared by every command run from the interactive shell
+_shared_client: Optional[ZeroCompAPIClient] = None
+
+
+@asynccontextmanager
+async def api_client(config: Dict[str, Any]):
+    """Yield the interactive shell's client if one is open, else a new one for this command."""
+    if _shared_client is not None:
+        yield _shared_client
+        return
+    
+    async with ZeroCompAPIClient(config['base_url'], config['api_key']) as client:
+        yield client
+
+
 def format_json_output(data: Any, indent: int = 2) -> str:
     """Format JSON data for pretty printing."""
+    if ORJSON_AVAILABLE and indent == 2:
+        return orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
     return json.dumps(data, indent=indent, default=str)
 
 
 async def cmd_current(args):
     """Get current alert command."""
-    config = load_config()
-    
-    async with ZeroCompAPIClient(config['base_url'], config['api_key']) as client:
+    async with api_client(args.config) as client:
         try:
             alert = await client.get_current_alert()
             
@@ -298,9 +345,7 @@ async def cmd_current(args):
 
 async def cmd_history(args):
     """Get alert history command."""
-    config = load_config()
-    
-    async with ZeroCompAPIClient(config['base_url'], config['api_key']) as client:
+    async with api_client(args.config) as client:
         try:
             history = await client.get_alert_history(
                 hours_back=args.hours,
@@ -314,18 +359,27 @@ async def cmd_history(args):
                 print(format_json_output(history))
             else:
                 alerts = history['alerts']
-                print(f"📊 Solar Flare History ({len(alerts)} alerts, page {history['page']}):")
-                print(f"   Total: {history['total_count']} alerts")
-                print(f"   Has More: {history['has_more']}")
-                print()
+                
+                # Build the listing and write it in one call; pages can be
+                # long and per-line print() is slow when piped
+                lines = [
+                    f"📊 Solar Flare History ({len(alerts)} alerts, page {history['page']}):\n",
+                    f"   Total: {history['total_count']} alerts\n",
+                    f"   Has More: {history['has_more']}\n",
+                    "\n"
+                ]
                 
                 for alert in alerts:
                     icon = "🚨" if alert['alert_triggered'] else "📊"
-                    print(f"{icon} {alert['timestamp']}")
-                    print(f"   Probability: {alert['flare_probability']:.1%}")
-                    print(f"   Severity: {alert['severity_level'].upper()}")
-                    print(f"   Message: {alert['message']}")
-                    print()
+                    lines.append(
+                        f"{icon} {alert['timestamp']}\n"
+                        f"   Probability: {alert['flare_probability']:.1%}\n"
+                        f"   Severity: {alert['severity_level'].upper()}\n"
+                        f"   Message: {alert['message']}\n"
+                        "\n"
+                    )
+                
+                sys.stdout.write("".join(lines))
                 
         except Exception as e:
             print(f"❌ Error: {e}")
@@ -334,9 +388,7 @@ async def cmd_history(args):
 
 async def cmd_stats(args):
     """Get statistics command."""
-    config = load_config()
-    
-    async with ZeroCompAPIClient(config['base_url'], config['api_key']) as client:
+    async with api_client(args.config) as client:
         try:
             stats = await client.get_alert_statistics(hours_back=args.hours)
             
@@ -362,9 +414,7 @@ async def cmd_stats(args):
 
 async def cmd_export(args):
     """Export data command."""
-    config = load_config()
-    
-    async with ZeroCompAPIClient(config['base_url'], config['api_key']) as client:
+    async with api_client(args.config) as client:
         try:
             filename = await client.export_csv(
                 hours_back=args.hours,
@@ -382,9 +432,7 @@ async def cmd_export(args):
 
 async def cmd_profile(args):
     """Get user profile command."""
-    config = load_config()
-    
-    async with ZeroCompAPIClient(config['base_url'], config['api_key']) as client:
+    async with api_client(args.config) as client:
         try:
             profile = await client.get_user_profile()
             
@@ -411,9 +459,7 @@ async def cmd_profile(args):
 
 async def cmd_usage(args):
     """Get usage statistics command."""
-    config = load_config()
-    
-    async with ZeroCompAPIClient(config['base_url'], config['api_key']) as client:
+    async with api_client(args.config) as client:
         try:
             usage = await client.get_usage_stats(hours_back=args.hours)
             
@@ -438,9 +484,49 @@ async def cmd_usage(args):
             sys.exit(1)
 
 
+async def cmd_dashboard(args):
+    """Dashboard command; fetches current alert, statistics and usage concurrently."""
+    async with api_client(args.config) as client:
+        try:
+            alert, stats, usage = await asyncio.gather(
+                client.get_current_alert(),
+                client.get_alert_statistics(hours_back=args.hours),
+                client.get_usage_stats(hours_back=args.hours)
+            )
+            
+            if args.json:
+                print(format_json_output({'current': alert, 'statistics': stats, 'usage': usage}))
+            else:
+                print("🌞 Current Solar Flare Alert:")
+                print(f"   Probability: {alert['current_probability']:.1%}")
+                print(f"   Severity: {alert['severity_level'].upper()}")
+                print(f"   Alert Active: {alert['alert_active']}")
+                print()
+                
+                print(f"📈 Statistics (last {args.hours} hours):")
+                for key, value in stats.get('statistics', {}).items():
+                    if isinstance(value, float):
+                        if 'probability' in key.lower():
+                            print(f"   {key.replace('_', ' ').title()}: {value:.1%}")
+                        else:
+                            print(f"   {key.replace('_', ' ').title()}: {value:.2f}")
+                    else:
+                        print(f"   {key.replace('_', ' ').title()}: {value}")
+                print()
+                
+                print(f"📊 Usage (last {args.hours} hours):")
+                print(f"   Subscription Tier: {usage['subscription_tier'].upper()}")
+                for key, value in usage.get('current_period', {}).items():
+                    print(f"   {key.replace('_', ' ').title()}: {value}")
+                
+        except Exception as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+
+
 async def cmd_websocket(args):
     """WebSocket connection command."""
-    config = load_config()
+    config = args.config
     
     client = WebSocketClient(config['ws_url'], config['api_key'])
     
@@ -452,9 +538,7 @@ async def cmd_websocket(args):
 
 async def cmd_health(args):
     """Health check command."""
-    config = load_config()
-    
-    async with ZeroCompAPIClient(config['base_url'], config['api_key']) as client:
+    async with api_client(args.config) as client:
         try:
             health = await client.health_check()
             
@@ -474,7 +558,7 @@ async def cmd_health(args):
 
 def cmd_config(args):
     """Configuration management command."""
-    config = load_config()
+    config = args.config
     
     if args.set_api_key:
         config['api_key'] = args.set_api_key
@@ -493,8 +577,102 @@ def cmd_config(args):
         print(f"   API Key: {'✅ Set' if config['api_key'] else '❌ Not set'}")
 
 
-def main():
-    """Main CLI entry point."""
+async def cmd_repl(args):
+    """Interactive shell command; all commands share one HTTP session."""
+    global _shared_client
+    
+    parser = build_parser()
+    config = args.config
+    loop = asyncio.get_running_loop()
+    
+    print("🌞 ZERO-COMP interactive shell. Type 'help' for commands, 'exit' to quit.")
+    
+    await open_shared_client(config)
+    try:
+        while True:
+            try:
+                line = await loop.run_in_executor(None, input, "zerocomp> ")
+            except EOFError:
+                print()
+                break
+            
+            if not await run_command_line(parser, line):
+                break
+    finally:
+        await _shared_client.__aexit__(None, None, None)
+        _shared_client = None
+
+
+async def open_shared_client(config: Dict[str, Any]) -> None:
+    """Open the interactive shell's client, replacing it if the base URL or API key changed."""
+    global _shared_client
+    
+    if _shared_client is not None:
+        if (_shared_client.base_url, _shared_client.api_key) == (config['base_url'].rstrip('/'), config['api_key']):
+            return
+        await _shared_client.__aexit__(None, None, None)
+        _shared_client = None
+    
+    _shared_client = await ZeroCompAPIClient(config['base_url'], config['api_key']).__aenter__()
+
+
+async def run_command_line(parser: argparse.ArgumentParser, line: str) -> bool:
+    """Run one interactive shell line. Returns False when the shell should exit."""
+    try:
+        words = shlex.split(line)
+    except ValueError as e:
+        print(f"❌ Error: {e}")
+        return True
+    
+    if not words:
+        return True
+    if words[0] in ('exit', 'quit'):
+        return False
+    if words[0] == 'help':
+        parser.print_help()
+        return True
+    
+    # argparse and the commands exit on errors; keep the shell running
+    try:
+        args = parser.parse_args(words)
+        if args.command == 'repl':
+            print("❌ Already in interactive mode")
+            return True
+        
+        args.config = load_config()
+        command_func = COMMANDS[args.command]
+        if asyncio.iscoroutinefunction(command_func):
+            await command_func(args)
+        else:
+            command_func(args)
+        
+        # Later commands should use a changed base URL or API key
+        if args.command == 'config':
+            await open_shared_client(args.config)
+    except SystemExit:
+        pass
+    
+    return True
+
+
+# Command mapping
+COMMANDS = {
+    'current': cmd_current,
+    'history': cmd_history,
+    'stats': cmd_stats,
+    'export': cmd_export,
+    'profile': cmd_profile,
+    'usage': cmd_usage,
+    'dashboard': cmd_dashboard,
+    'websocket': cmd_websocket,
+    'health': cmd_health,
+    'config': cmd_config,
+    'repl': cmd_repl
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line argument parser."""
     parser = argparse.ArgumentParser(
         description="ZERO-COMP Solar Weather API CLI Client",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -504,8 +682,10 @@ Examples:
   zerocomp history --hours 48         # Get 48 hours of history
   zerocomp history --severity high    # Get high severity alerts only
   zerocomp export --hours 168         # Export 1 week of data
+  zerocomp dashboard                  # Current alert, stats and usage at once
   zerocomp websocket --duration 60    # Listen to WebSocket for 60 seconds
   zerocomp config --set-api-key KEY   # Set API key
+  zerocomp repl                       # Run several commands over one connection
   
 Environment Variables:
   ZEROCOMP_API_KEY     API key for authentication
@@ -549,6 +729,11 @@ Environment Variables:
     usage_parser.add_argument('--hours', type=int, default=24, help='Hours to analyze (default: 24)')
     usage_parser.add_argument('--json', action='store_true', help='Output as JSON')
     
+    # Dashboard command
+    dashboard_parser = subparsers.add_parser('dashboard', help='Get current alert, statistics and usage together')
+    dashboard_parser.add_argument('--hours', type=int, default=24, help='Hours to analyze (default: 24)')
+    dashboard_parser.add_argument('--json', action='store_true', help='Output as JSON')
+    
     # WebSocket command
     ws_parser = subparsers.add_parser('websocket', help='Connect to WebSocket for real-time alerts')
     ws_parser.add_argument('--duration', type=int, help='Duration in seconds (default: unlimited)')
@@ -562,32 +747,40 @@ Environment Variables:
     config_parser.add_argument('--set-api-key', help='Set API key')
     config_parser.add_argument('--set-base-url', help='Set base URL')
     
+    # Interactive shell command
+    subparsers.add_parser('repl', help='Interactive shell reusing one connection across commands')
+    
+    return parser
+
+
+def main():
+    """Main CLI entry point."""
+    parser = build_parser()
     args = parser.parse_args()
     
     if not args.command:
         parser.print_help()
         sys.exit(1)
     
-    # Command mapping
-    commands = {
-        'current': cmd_current,
-        'history': cmd_history,
-        'stats': cmd_stats,
-        'export': cmd_export,
-        'profile': cmd_profile,
-        'usage': cmd_usage,
-        'websocket': cmd_websocket,
-        'health': cmd_health,
-        'config': cmd_config
-    }
+    # Load configuration once and hand it to the command
+    args.config = load_config()
     
-    command_func = commands.get(args.command)
+    command_func = COMMANDS.get(args.command)
     if not command_func:
         print(f"❌ Unknown command: {args.command}")
         sys.exit(1)
     
     # Run async commands
     if args.command != 'config':
+        # uvloop (installed with uvicorn[standard]) where available; it
+        # doesn't support Windows
+        if sys.platform != 'win32':
+            try:
+                import uvloop
+                asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+            except ImportError:
+                pass
+        
         try:
             asyncio.run(command_func(args))
         except KeyboardInterrupt:
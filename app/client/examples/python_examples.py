@@ -7,7 +7,7 @@ This file demonstrates various usage patterns for the ZERO-COMP Solar Weather AP
 
 import asyncio
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 from app.client.python_sdk import (
     ZeroCompClient, AsyncZeroCompClient, WebSocketClient,
     SeverityLevel, SubscriptionTier,
@@ -171,11 +171,26 @@ async def example_websocket_monitoring():
         async with WebSocketClient(token=api_key) as ws:
             print("🔗 Connected to ZERO-COMP WebSocket")
             
-            # Listen for 30 seconds
-            start_time = datetime.now()
-            timeout = timedelta(seconds=30)
+            # Listen for 30 seconds; the deadline also bounds the wait
+            # for each message, so a quiet connection still times out
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + 30.0
+            messages = ws.listen()
             
-            async for message in ws.listen():
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    print("⏰ Timeout reached, disconnecting...")
+                    break
+                
+                try:
+                    message = await asyncio.wait_for(messages.__anext__(), remaining)
+                except asyncio.TimeoutError:
+                    print("⏰ Timeout reached, disconnecting...")
+                    break
+                except StopAsyncIteration:
+                    break
+                
                 print(f"📨 Received: {message}")
                 
                 if message.get('type') == 'alert':
@@ -187,11 +202,6 @@ async def example_websocket_monitoring():
                         print(f"🚨 ALERT: {probability:.1%} probability ({severity})")
                     else:
                         print(f"📊 Update: {probability:.1%} probability ({severity})")
-                
-                # Break after timeout
-                if datetime.now() - start_time > timeout:
-                    print("⏰ Timeout reached, disconnecting...")
-                    break
                     
     except Exception as e:
         print(f"❌ WebSocket error: {e}")
@@ -288,6 +298,16 @@ def example_monitoring_callback():
         print(f"❌ Monitoring error: {e}")
 
 
+async def _collect(name, coro, results):
+    """Store a call's result, keeping API errors but letting auth failures through."""
+    try:
+        results[name] = await coro
+    except AuthenticationError:
+        raise
+    except ZeroCompAPIError as e:
+        results[name] = e
+
+
 async def example_batch_operations():
     """Batch operations example."""
     print("\n=== Batch Operations ===")
@@ -297,17 +317,27 @@ async def example_batch_operations():
     async with AsyncZeroCompClient(api_key=api_key) as client:
         try:
             # Perform multiple operations concurrently
-            tasks = [
-                client.get_current_alert(),
-                client.get_alert_history(hours_back=24),
-                client.get_alert_statistics(hours_back=24),
-                client.get_user_profile(),
-                client.get_usage_statistics(hours_back=24)
-            ]
+            calls = {
+                'current_alert': client.get_current_alert(),
+                'history': client.get_alert_history(hours_back=24),
+                'stats': client.get_alert_statistics(hours_back=24),
+                'profile': client.get_user_profile(),
+                'usage': client.get_usage_statistics(hours_back=24)
+            }
             
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            results = {}
+            tasks = [asyncio.ensure_future(_collect(name, coro, results)) for name, coro in calls.items()]
+            try:
+                await asyncio.gather(*tasks)
+            except AuthenticationError:
+                # Every other call would fail the same way; stop them early
+                for task in tasks:
+                    task.cancel()
+                raise
             
-            current_alert, history, stats, profile, usage = results
+            current_alert = results['current_alert']
+            history = results['history']
+            profile = results['profile']
             
             print("📊 Batch Results:")
             if not isinstance(current_alert, Exception):
@@ -317,6 +347,8 @@ async def example_batch_operations():
             if not isinstance(profile, Exception):
                 print(f"   Profile: {profile.subscription_tier.value}")
             
+        except AuthenticationError:
+            print("❌ Authentication failed - check your API key")
         except Exception as e:
             print(f"❌ Batch error: {e}")
 
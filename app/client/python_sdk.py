@@ -13,7 +13,8 @@ from datetime import datetime, timedelta
 from dataclasses import dataclass
 from enum import Enum
 import aiohttp
-import requests
+import httpx
+import msgpack
 import websockets
 from urllib.parse import urljoin, urlencode
 
@@ -32,9 +33,22 @@ class SubscriptionTier(str, Enum):
     ENTERPRISE = "enterprise"
 
 
+# Plain dict lookup instead of SeverityLevel(value) for every parsed row
+_SEVERITY_LEVELS = {level.value: level for level in SeverityLevel}
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """Parse an API timestamp, accepting a trailing 'Z' for UTC."""
+    if value.endswith('Z'):
+        return datetime.fromisoformat(value[:-1] + '+00:00')
+    return datetime.fromisoformat(value)
+
+
 @dataclass
 class CurrentAlert:
     """Current solar flare alert data."""
+    __slots__ = ('current_probability', 'severity_level', 'last_updated', 'next_update', 'alert_active')
+    
     current_probability: float
     severity_level: SeverityLevel
     last_updated: datetime
@@ -46,9 +60,9 @@ class CurrentAlert:
         """Create CurrentAlert from API response."""
         return cls(
             current_probability=data['current_probability'],
-            severity_level=SeverityLevel(data['severity_level']),
-            last_updated=datetime.fromisoformat(data['last_updated'].replace('Z', '+00:00')),
-            next_update=datetime.fromisoformat(data['next_update'].replace('Z', '+00:00')),
+            severity_level=_SEVERITY_LEVELS[data['severity_level']],
+            last_updated=_parse_timestamp(data['last_updated']),
+            next_update=_parse_timestamp(data['next_update']),
             alert_active=data['alert_active']
         )
 
@@ -56,6 +70,8 @@ class CurrentAlert:
 @dataclass
 class AlertData:
     """Individual alert data point."""
+    __slots__ = ('id', 'timestamp', 'flare_probability', 'severity_level', 'alert_triggered', 'message')
+    
     id: str
     timestamp: datetime
     flare_probability: float
@@ -68,9 +84,9 @@ class AlertData:
         """Create AlertData from API response."""
         return cls(
             id=data['id'],
-            timestamp=datetime.fromisoformat(data['timestamp'].replace('Z', '+00:00')),
+            timestamp=_parse_timestamp(data['timestamp']),
             flare_probability=data['flare_probability'],
-            severity_level=SeverityLevel(data['severity_level']),
+            severity_level=_SEVERITY_LEVELS[data['severity_level']],
             alert_triggered=data['alert_triggered'],
             message=data['message']
         )
@@ -79,6 +95,8 @@ class AlertData:
 @dataclass
 class HistoricalAlerts:
     """Historical alerts response."""
+    __slots__ = ('alerts', 'total_count', 'page', 'page_size', 'has_more')
+    
     alerts: List[AlertData]
     total_count: int
     page: int
@@ -89,7 +107,7 @@ class HistoricalAlerts:
     def from_dict(cls, data: Dict[str, Any]) -> 'HistoricalAlerts':
         """Create HistoricalAlerts from API response."""
         return cls(
-            alerts=[AlertData.from_dict(alert) for alert in data['alerts']],
+            alerts=list(map(AlertData.from_dict, data['alerts'])),
             total_count=data['total_count'],
             page=data['page'],
             page_size=data['page_size'],
@@ -97,6 +115,14 @@ class HistoricalAlerts:
         )
 
 
+# One pooled HTTP/2 connection carries concurrent requests as multiplexed
+# streams, so keep it alive between calls instead of re-handshaking
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, keepalive_expiry=30)
+
+# Subprotocol under which the server accepts msgpack binary frames
+MSGPACK_SUBPROTOCOL = "zerocomp.msgpack.v1"
+
+
 class ZeroCompAPIError(Exception):
     """Base exception for ZERO-COMP API errors."""
     
@@ -152,9 +178,24 @@ class ZeroCompClient:
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         
-        self.session = requests.Session()
-        if api_key:
-            self.session.headers.update({'Authorization': f'Bearer {api_key}'})
+        headers = {'Authorization': f'Bearer {api_key}'} if api_key else {}
+        self.session = httpx.Client(
+            base_url=self.base_url,
+            headers=headers,
+            timeout=timeout,
+            http2=True,
+            limits=HTTP_LIMITS
+        )
+    
+    def close(self) -> None:
+        """Close the pooled HTTP connections."""
+        self.session.close()
+    
+    def __enter__(self) -> 'ZeroCompClient':
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
     
     def get_current_alert(self) -> CurrentAlert:
         """
@@ -194,6 +235,25 @@ class AsyncZeroCompClient:
         self.timeout = timeout
         self.max_retries = max_retries
         self.retry_delay = retry_delay
+        
+        headers = {'Authorization': f'Bearer {api_key}'} if api_key else {}
+        self.session = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            timeout=timeout,
+            http2=True,
+            limits=HTTP_LIMITS
+        )
+    
+    async def close(self) -> None:
+        """Close the pooled HTTP connections."""
+        await self.session.aclose()
+    
+    async def __aenter__(self) -> 'AsyncZeroCompClient':
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
     
     async def get_current_alert(self) -> CurrentAlert:
         """Get the current solar flare alert."""
@@ -212,11 +272,49 @@ class WebSocketClient:
         """Initialize WebSocket client."""
         self.token = token
         self.ws_url = ws_url
+        self.websocket = None
+        self.binary = False
     
     async def connect(self) -> None:
-        """Connect to the WebSocket."""
-        # Implementation would go here
-        pass
+        """Connect to the WebSocket, offering msgpack framing."""
+        url = f"{self.ws_url}?{urlencode({'token': self.token})}" if self.token else self.ws_url
+        self.websocket = await websockets.connect(url, subprotocols=[MSGPACK_SUBPROTOCOL])
+        self.binary = self.websocket.subprotocol == MSGPACK_SUBPROTOCOL
+    
+    async def close(self) -> None:
+        """Close the WebSocket connection."""
+        if self.websocket is not None:
+            await self.websocket.close()
+            self.websocket = None
+    
+    async def __aenter__(self) -> 'WebSocketClient':
+        await self.connect()
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+    
+    async def send(self, message: Dict[str, Any]) -> None:
+        """Send a message, as msgpack if the server accepted it."""
+        if self.binary:
+            await self.websocket.send(msgpack.packb(message))
+        else:
+            await self.websocket.send(json.dumps(message))
+    
+    async def listen(self) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Yield messages from the server as they arrive.
+        
+        Binary frames are msgpack and text frames are JSON; either may hold
+        a single message or an array of messages sent together.
+        """
+        async for raw in self.websocket:
+            payload = msgpack.unpackb(raw) if isinstance(raw, bytes) else json.loads(raw)
+            if isinstance(payload, list):
+                for message in payload:
+                    yield message
+            else:
+                yield payload
 
 
 # Convenience functions for quick usage
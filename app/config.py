@@ -1,10 +1,16 @@
 """Configuration management for the solar weather API."""
 
-from pydantic import Field
+from dotenv import load_dotenv
+from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Any, Mapping, Optional, Tuple, Union
 import os
 
+# Read .env into the environment once at import instead of having each
+# settings class below re-parse it; real environment variables still win
+load_dotenv(".env")
+
 
 class DatabaseConfig(BaseSettings):
     """Database configuration settings."""
@@ -15,7 +21,6 @@ class DatabaseConfig(BaseSettings):
     database_url: str = Field(default="", env="DATABASE_URL")
     
     class Config:
-        env_file = ".env"
         extra = "ignore"
 
 
@@ -27,7 +32,6 @@ class AuthConfig(BaseSettings):
     access_token_expire_minutes: int = Field(default=30, env="ACCESS_TOKEN_EXPIRE_MINUTES")
     
     class Config:
-        env_file = ".env"
         extra = "ignore"
 
 
@@ -41,7 +45,6 @@ class ModelConfig(BaseSettings):
     prediction_interval_minutes: int = Field(default=10, env="PREDICTION_INTERVAL_MINUTES")
     
     class Config:
-        env_file = ".env"
         extra = "ignore"
 
 
@@ -56,7 +59,6 @@ class ExternalServicesConfig(BaseSettings):
     razorpay_webhook_secret: Optional[str] = Field(None, env="RAZORPAY_WEBHOOK_SECRET")
     
     class Config:
-        env_file = ".env"
         extra = "ignore"
 
 
@@ -69,9 +71,16 @@ class APIConfig(BaseSettings):
     
     host: str = Field(default="0.0.0.0", env="HOST")
     port: int = Field(default=8000, env="PORT")
+    workers: int = Field(default=1, env="WEB_CONCURRENCY")
+    
+    # Worker threads for sync dependencies and run_in_threadpool calls
+    thread_pool_size: int = Field(default=100, env="THREAD_POOL_SIZE")
     
-    cors_origins: list = Field(
-        default=["http://localhost:3000", "https://zero-comp.vercel.app"],
+    # Ordered, since the first origin doubles as the frontend URL. The str
+    # in the union lets a comma-separated CORS_ORIGINS reach the validator
+    # instead of failing JSON decoding
+    cors_origins: Union[Tuple[str, ...], str] = Field(
+        default=("http://localhost:3000", "https://zero-comp.vercel.app"),
         env="CORS_ORIGINS"
     )
     
@@ -80,14 +89,15 @@ class APIConfig(BaseSettings):
     rate_limit_window: int = Field(default=60, env="RATE_LIMIT_WINDOW_SECONDS")
     
     class Config:
-        env_file = ".env"
         extra = "ignore"
-        
-        @classmethod
-        def parse_env_var(cls, field_name: str, raw_val: str) -> Any:
-            if field_name == 'cors_origins':
-                return [x.strip() for x in raw_val.split(',')]
-            return cls.json_loads(raw_val)
+    
+    @field_validator("cors_origins", mode="before")
+    @classmethod
+    def split_cors_origins(cls, value: Any) -> Any:
+        """Accept CORS_ORIGINS as a comma-separated list."""
+        if isinstance(value, str):
+            return tuple(origin.strip() for origin in value.split(",") if origin.strip())
+        return value
 
 
 class LoggingConfig(BaseSettings):
@@ -98,10 +108,37 @@ class LoggingConfig(BaseSettings):
     log_file: Optional[str] = Field(None, env="LOG_FILE")
     
     class Config:
-        env_file = ".env"
         extra = "ignore"
 
 
+# Read-only defaults shared by every Settings instance instead of a
+# mutable dict that gets copied on each instantiation; the fields below
+# skip default validation so they stay read-only
+_DEFAULT_SUBSCRIPTION_TIERS = MappingProxyType({
+    "free": MappingProxyType({
+        "rate_limits": MappingProxyType({"alerts": 10, "history": 5}),
+        "features": ("dashboard",),
+        "price": 0
+    }),
+    "pro": MappingProxyType({
+        "rate_limits": MappingProxyType({"alerts": 1000, "history": 500, "websocket": True}),
+        "features": ("dashboard", "api", "websocket"),
+        "price": 50
+    }),
+    "enterprise": MappingProxyType({
+        "rate_limits": MappingProxyType({"alerts": 10000, "history": 5000, "websocket": True}),
+        "features": ("dashboard", "api", "websocket", "csv_export", "sla"),
+        "price": 500
+    })
+})
+
+_DEFAULT_ALERT_THRESHOLDS = MappingProxyType({
+    "low": 0.3,
+    "medium": 0.6,
+    "high": 0.8
+})
+
+
 class Settings(BaseSettings):
     """Main application settings."""
     
@@ -109,45 +146,26 @@ class Settings(BaseSettings):
     environment: str = Field(default="development", env="ENVIRONMENT")
     
     # Sub-configurations
-    database: DatabaseConfig = DatabaseConfig()
-    auth: AuthConfig = AuthConfig()
-    model: ModelConfig = ModelConfig()
-    external: ExternalServicesConfig = ExternalServicesConfig()
-    api: APIConfig = APIConfig()
-    logging: LoggingConfig = LoggingConfig()
+    database: DatabaseConfig = Field(default_factory=DatabaseConfig)
+    auth: AuthConfig = Field(default_factory=AuthConfig)
+    model: ModelConfig = Field(default_factory=ModelConfig)
+    external: ExternalServicesConfig = Field(default_factory=ExternalServicesConfig)
+    api: APIConfig = Field(default_factory=APIConfig)
+    logging: LoggingConfig = Field(default_factory=LoggingConfig)
     
     # Subscription tier configurations
-    subscription_tiers: Dict[str, Dict[str, Any]] = Field(
-        default={
-            "free": {
-                "rate_limits": {"alerts": 10, "history": 5},
-                "features": ["dashboard"],
-                "price": 0
-            },
-            "pro": {
-                "rate_limits": {"alerts": 1000, "history": 500, "websocket": True},
-                "features": ["dashboard", "api", "websocket"],
-                "price": 50
-            },
-            "enterprise": {
-                "rate_limits": {"alerts": 10000, "history": 5000, "websocket": True},
-                "features": ["dashboard", "api", "websocket", "csv_export", "sla"],
-                "price": 500
-            }
-        }
+    subscription_tiers: Mapping[str, Mapping[str, Any]] = Field(
+        default_factory=lambda: _DEFAULT_SUBSCRIPTION_TIERS,
+        validate_default=False
     )
     
     # Alert thresholds
-    default_alert_thresholds: Dict[str, float] = Field(
-        default={
-            "low": 0.3,
-            "medium": 0.6,
-            "high": 0.8
-        }
+    default_alert_thresholds: Mapping[str, float] = Field(
+        default_factory=lambda: _DEFAULT_ALERT_THRESHOLDS,
+        validate_default=False
     )
     
     class Config:
-        env_file = ".env"
         case_sensitive = False
         extra = "ignore"
 
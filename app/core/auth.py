@@ -3,6 +3,7 @@ JWT Authentication Module
 Handles token creation, verification, and password hashing
 """
 
+import hmac
 import structlog
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
@@ -237,5 +238,6 @@ def hash_api_key(api_key: str) -> str:
 def verify_api_key(provided_key: str, stored_hash: str) -> bool:
     """
     Verify an API key against its stored hash
+    Compared in constant time so timing doesn't reveal matching prefixes
     """
-    return hash_api_key(provided_key) == stored_hash
+    return hmac.compare_digest(hash_api_key(provided_key), stored_hash)
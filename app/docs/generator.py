@@ -2,7 +2,7 @@
 
 import json
 import os
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Iterator
 from pathlib import Path
 
 from app.docs.openapi_customization import add_code_examples
@@ -62,53 +62,56 @@ Authorization: Bearer <your-token-or-api-key>
 
 """
         
-        # Process each endpoint
-        paths = schema.get('paths', {})
+        # Endpoint sections are written as they are produced rather than
+        # concatenated into one string first
+        file_path = self.output_dir / "api-reference.md"
+        with open(file_path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            f.write(content)
+            f.writelines(self._iter_endpoint_docs(schema.get('paths', {})))
+    
+    def _iter_endpoint_docs(self, paths: Dict[str, Any]) -> Iterator[str]:
+        """Yield the API reference text for every path, piece by piece."""
         for path, methods in paths.items():
-            content += f"\n### {path}\n\n"
+            yield f"\n### {path}\n\n"
             
             for method, details in methods.items():
                 if method.upper() in ['GET', 'POST', 'PUT', 'DELETE']:
-                    content += self._format_endpoint_docs(path, method.upper(), details)
-        
-        self._write_file("api-reference.md", content) 
+                    yield from self._format_endpoint_docs(path, method.upper(), details) 
    
-    def _format_endpoint_docs(self, path: str, method: str, details: Dict[str, Any]) -> str:
-        """Format documentation for a single endpoint."""
+    def _format_endpoint_docs(self, path: str, method: str, details: Dict[str, Any]) -> Iterator[str]:
+        """Yield documentation for a single endpoint."""
         
-        content = f"#### {method} {path}\n\n"
+        yield f"#### {method} {path}\n\n"
         
         # Add summary and description
         if 'summary' in details:
-            content += f"**{details['summary']}**\n\n"
+            yield f"**{details['summary']}**\n\n"
         
         if 'description' in details:
-            content += f"{details['description']}\n\n"
+            yield f"{details['description']}\n\n"
         
         # Add parameters
         if 'parameters' in details:
-            content += "**Parameters:**\n\n"
+            yield "**Parameters:**\n\n"
             for param in details['parameters']:
                 required = " (required)" if param.get('required', False) else ""
-                content += f"- `{param['name']}`{required}: {param.get('description', '')}\n"
-            content += "\n"
+                yield f"- `{param['name']}`{required}: {param.get('description', '')}\n"
+            yield "\n"
         
         # Add request body
         if 'requestBody' in details:
-            content += "**Request Body:**\n\n"
-            content += "```json\n"
+            yield "**Request Body:**\n\n"
+            yield "```json\n"
             # Add example request body if available
-            content += "{\n  // Request body schema\n}\n"
-            content += "```\n\n"
+            yield "{\n  // Request body schema\n}\n"
+            yield "```\n\n"
         
         # Add responses
         if 'responses' in details:
-            content += "**Responses:**\n\n"
+            yield "**Responses:**\n\n"
             for status_code, response in details['responses'].items():
-                content += f"- `{status_code}`: {response.get('description', '')}\n"
-            content += "\n"
-        
-        return content
+                yield f"- `{status_code}`: {response.get('description', '')}\n"
+            yield "\n"
     
     def _generate_auth_guide(self) -> None:
         """Generate authentication documentation."""
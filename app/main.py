@@ -8,6 +8,7 @@ import time
 import uuid
 import logging
 from contextlib import asynccontextmanager
+import anyio
 
 from app.config import get_settings
 from app.models.core import ErrorResponse
@@ -30,17 +31,56 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("Starting ZERO-COMP Solar Weather API")
     
+    # Default anyio limiter is 40 threads; the sync supabase and razorpay
+    # calls need more headroom
+    anyio.to_thread.current_default_thread_limiter().total_tokens = get_settings().api.thread_pool_size
+    
+    # Connect the shared cache once instead of per request
+    from app.services.cache import get_cache_service
+    app.state.cache = get_cache_service()
+    await app.state.cache.connect()
+    
+    # Shared asyncpg pool used by the repositories
+    from app.services.database import get_database_manager
+    app.state.db = await get_database_manager()
+    try:
+        await app.state.db.initialize_pool(min_size=5, max_size=20)
+    except Exception as e:
+        logger.error("Failed to initialize database pool", exception=e)
+    
+    # Dedicated pool so health probes don't wait on the main pool
+    from app.services.database import get_health_check_pool
+    app.state.health_db = await get_health_check_pool()
+    try:
+        await app.state.health_db.initialize()
+    except Exception as e:
+        logger.error("Failed to initialize health check pool", exception=e)
+    
+    # Started on its own so a monitoring/backup failure can't leave request
+    # handlers filling a queue that nothing drains
+    from app.services.usage_logger import initialize_usage_logger, shutdown_usage_logger
+    try:
+        await initialize_usage_logger()
+        logger.info("Usage logger initialized")
+    except Exception as e:
+        logger.error("Failed to initialize usage logger", exception=e)
+    
     # Initialize monitoring and backup services
     try:
-        from app.services.monitoring import initialize_monitoring
+        from app.services.monitoring import initialize_monitoring, get_alerting_service
         from app.services.backup_recovery import initialize_backup_service
+        from app.api.health import start_system_sampler
         
         await initialize_monitoring()
+        app.state.alerting = get_alerting_service()
         logger.info("Monitoring system initialized")
         
         await initialize_backup_service()
         logger.info("Backup service initialized")
         
+        await start_system_sampler()
+        logger.info("System metrics sampler started")
+        
     except Exception as e:
         logger.error("Failed to initialize monitoring/backup services", exception=e)
     
@@ -49,12 +89,25 @@ async def lifespan(app: FastAPI):
     # Shutdown
     logger.info("Shutting down ZERO-COMP Solar Weather API")
     
+    # Flush queued usage records before the database pool closes
+    try:
+        await shutdown_usage_logger()
+    except Exception as e:
+        logger.error("Failed to flush usage logger", exception=e)
+    
     try:
         from app.services.monitoring import shutdown_monitoring
         from app.services.backup_recovery import shutdown_backup_service
+        from app.api.health import stop_system_sampler
+        from app.services.razorpay_service import razorpay_service
         
         await shutdown_monitoring()
         await shutdown_backup_service()
+        await stop_system_sampler()
+        await app.state.cache.close()
+        await app.state.health_db.close()
+        await app.state.db.close_pool()
+        razorpay_service.close()
         logger.info("Services shut down successfully")
         
     except Exception as e:
@@ -205,10 +258,10 @@ ws.onmessage = (event) => {
         ]
     )
     
-    # Add CORS middleware
+    # Add CORS middleware; a set makes the per-request origin check O(1)
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=settings.api.cors_origins,
+        allow_origins=frozenset(settings.api.cors_origins),
         allow_credentials=True,
         allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
         allow_headers=["*"],
@@ -344,5 +397,11 @@ if __name__ == "__main__":
         host=settings.api.host,
         port=settings.api.port,
         reload=settings.api.debug,
+        workers=settings.api.workers,
+        loop="uvloop",
+        http="httptools",
+        # Broadcasts send the same frame to every client; per-connection
+        # deflate would compress it once per client
+        ws_per_message_deflate=False,
         log_level=settings.logging.log_level.lower()
     )
\ No newline at end of file
@@ -13,6 +13,10 @@ from app.models.core import ErrorResponse
 
 logger = get_logger(__name__)
 
+# Orchestrator probe endpoints; polled constantly, so they skip per-request
+# logging and metrics
+PROBE_PATHS = frozenset({"/health", "/health/", "/health/liveness", "/health/readiness"})
+
 
 class RequestLoggingMiddleware(BaseHTTPMiddleware):
     """Middleware for logging HTTP requests and responses."""
@@ -22,6 +26,9 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process request and log details."""
+        if request.url.path in PROBE_PATHS:
+            return await call_next(request)
+        
         # Generate request ID if not present
         if not hasattr(request.state, "request_id"):
             request.state.request_id = str(uuid.uuid4())
@@ -107,6 +114,9 @@ class PerformanceMonitoringMiddleware(BaseHTTPMiddleware):
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Monitor request performance."""
+        if request.url.path in PROBE_PATHS:
+            return await call_next(request)
+        
         start_time = time.time()
         
         response = await call_next(request)
@@ -3,25 +3,41 @@
 from fastapi import Request, HTTPException, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional, Dict, Any, List
+import math
 import time
 import structlog
 from datetime import datetime, timedelta
+from types import MappingProxyType
 
 from app.models.core import SubscriptionTier, UserSubscription
 from app.repositories.subscriptions import get_subscriptions_repository
 from app.services.auth_service import get_auth_service, get_current_user
+from app.services.cache import get_cache_service
 from app.config import get_settings
 
 logger = structlog.get_logger(__name__)
 security = HTTPBearer(auto_error=False)
 
+# Tier configuration is fixed for the life of the process; resolve it once
+_TIER_RATE_LIMITS = MappingProxyType({
+    tier: MappingProxyType(config.get("rate_limits", {}))
+    for tier, config in get_settings().subscription_tiers.items()
+})
+_EMPTY_RATE_LIMITS = MappingProxyType({})
+
+_TIER_HIERARCHY = MappingProxyType({
+    SubscriptionTier.FREE: 0,
+    SubscriptionTier.PRO: 1,
+    SubscriptionTier.ENTERPRISE: 2
+})
+
 
 class SubscriptionEnforcer:
     """Handles subscription tier enforcement and rate limiting."""
     
     def __init__(self):
         self.settings = get_settings()
-        self.rate_limit_cache: Dict[str, Dict[str, Any]] = {}
+        self.cache = get_cache_service()
         
     def get_tier_config(self, tier: SubscriptionTier) -> Dict[str, Any]:
         """Get configuration for a subscription tier."""
@@ -35,11 +51,10 @@ class SubscriptionEnforcer:
     
     def get_rate_limit(self, tier: SubscriptionTier, endpoint_type: str) -> int:
         """Get rate limit for tier and endpoint type."""
-        tier_config = self.get_tier_config(tier)
-        rate_limits = tier_config.get("rate_limits", {})
+        rate_limits = _TIER_RATE_LIMITS.get(tier.value, _EMPTY_RATE_LIMITS)
         return rate_limits.get(endpoint_type, 0)
     
-    def check_rate_limit(
+    async def check_rate_limit(
         self, 
         user_id: str, 
         tier: SubscriptionTier, 
@@ -49,6 +64,9 @@ class SubscriptionEnforcer:
         """
         Check if user has exceeded rate limit for endpoint type.
         
+        Uses a token bucket holding `rate_limit` tokens that refills at
+        `rate_limit / window_seconds` tokens per second.
+        
         Returns:
             (is_allowed, rate_limit_info)
         """
@@ -58,38 +76,20 @@ class SubscriptionEnforcer:
         if rate_limit == 0:
             return True, {"limit": "unlimited", "remaining": "unlimited"}
         
-        # Get current time window
-        current_time = time.time()
-        window_start = current_time - window_seconds
-        
-        # Initialize user cache if not exists
-        cache_key = f"{user_id}:{endpoint_type}"
-        if cache_key not in self.rate_limit_cache:
-            self.rate_limit_cache[cache_key] = {
-                "requests": [],
-                "window_start": window_start
-            }
-        
-        user_cache = self.rate_limit_cache[cache_key]
-        
-        # Clean old requests outside the window
-        user_cache["requests"] = [
-            req_time for req_time in user_cache["requests"] 
-            if req_time > window_start
-        ]
-        
-        # Check if limit exceeded
-        current_requests = len(user_cache["requests"])
-        is_allowed = current_requests < rate_limit
-        
-        if is_allowed:
-            # Add current request to cache
-            user_cache["requests"].append(current_time)
+        refill_rate = rate_limit / window_seconds
+        is_allowed, tokens = await self.cache.token_bucket_consume(
+            user_id,
+            endpoint_type,
+            rate=refill_rate,
+            burst=rate_limit
+        )
         
+        current_time = time.time()
         rate_limit_info = {
             "limit": rate_limit,
-            "remaining": max(0, rate_limit - current_requests - (1 if is_allowed else 0)),
-            "reset_time": window_start + window_seconds,
+            "remaining": int(tokens),
+            "reset_time": current_time + (rate_limit - tokens) / refill_rate,
+            "retry_after": 0 if is_allowed else math.ceil((1 - tokens) / refill_rate),
             "window_seconds": window_seconds
         }
         
@@ -113,7 +113,8 @@ class SubscriptionEnforcer:
                     # Downgrade to free tier if expired
                     await subscription_repo.update_subscription_tier(
                         user_id, 
-                        SubscriptionTier.FREE
+                        SubscriptionTier.FREE,
+                        subscription=subscription
                     )
                     subscription.tier = SubscriptionTier.FREE
                     subscription.is_active = True
@@ -161,15 +162,8 @@ async def require_subscription_tier(
             detail="No subscription found. Please subscribe to access this feature."
         )
     
-    # Define tier hierarchy
-    tier_hierarchy = {
-        SubscriptionTier.FREE: 0,
-        SubscriptionTier.PRO: 1,
-        SubscriptionTier.ENTERPRISE: 2
-    }
-    
-    user_tier_level = tier_hierarchy.get(subscription.tier, 0)
-    required_tier_level = tier_hierarchy.get(required_tier, 0)
+    user_tier_level = _TIER_HIERARCHY.get(subscription.tier, 0)
+    required_tier_level = _TIER_HIERARCHY.get(required_tier, 0)
     
     if user_tier_level < required_tier_level:
         raise HTTPException(
@@ -248,7 +242,7 @@ async def enforce_rate_limit(
     else:
         tier = subscription.tier
     
-    is_allowed, rate_limit_info = enforcer.check_rate_limit(
+    is_allowed, rate_limit_info = await enforcer.check_rate_limit(
         current_user["id"], 
         tier, 
         endpoint_type
@@ -264,7 +258,7 @@ async def enforce_rate_limit(
                 "X-RateLimit-Limit": str(rate_limit_info["limit"]),
                 "X-RateLimit-Remaining": str(rate_limit_info["remaining"]),
                 "X-RateLimit-Reset": str(int(rate_limit_info["reset_time"])),
-                "Retry-After": str(int(rate_limit_info["reset_time"] - time.time()))
+                "Retry-After": str(rate_limit_info["retry_after"])
             }
         )
     
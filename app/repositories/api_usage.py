@@ -1,6 +1,6 @@
 """Repository for API usage tracking and analytics."""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, NamedTuple
 from datetime import datetime, timedelta
 import logging
 from app.repositories.base import BaseRepository
@@ -9,9 +9,41 @@ from app.models.core import APIUsageRecord
 logger = logging.getLogger(__name__)
 
 
+class UsageRecord(NamedTuple):
+    """Compact usage row queued by request handlers; fields in column order."""
+    user_id: Optional[str]
+    endpoint: str
+    method: str
+    status_code: int
+    response_time_ms: Optional[int]
+    ip_address: Optional[str]
+    user_agent: Optional[str]
+    api_key_used: bool
+    timestamp: datetime
+
+
+def user_statistics_from_row(row: Dict[str, Any], hours_back: int) -> Dict[str, Any]:
+    """Build the per-user usage statistics dict from an aggregate row."""
+    total_requests = row['total_requests']
+    return {
+        'total_requests': total_requests,
+        'avg_response_time': float(row['avg_response_time']) if row['avg_response_time'] else 0.0,
+        'success_count': row['success_count'],
+        'error_count': row['error_count'],
+        'rate_limit_hits': row['rate_limit_hits'],
+        'api_key_requests': row['api_key_requests'],
+        'unique_endpoints': row['unique_endpoints'],
+        'success_rate': (row['success_count'] / total_requests * 100) if total_requests > 0 else 0.0,
+        'hours_analyzed': hours_back
+    }
+
+
 class APIUsageRepository(BaseRepository[APIUsageRecord]):
     """Repository for managing API usage tracking."""
-    
+
+    # Columns written by bulk_create, in placeholder order
+    _BULK_COLUMNS = UsageRecord._fields
+
     def __init__(self):
         super().__init__("api_usage")
     
@@ -102,7 +134,45 @@ class APIUsageRepository(BaseRepository[APIUsageRecord]):
         )
         
         return await self.create(usage_record)
-    
+
+    async def bulk_create(self, records: List[UsageRecord]) -> int:
+        """
+        Insert many usage records with a single multi-row INSERT.
+
+        Args:
+            records: Usage records, one row each
+
+        Returns:
+            Number of records inserted
+        """
+        if not records:
+            return 0
+
+        try:
+            db_manager = await self._get_db_manager()
+
+            columns = self._BULK_COLUMNS
+            width = len(columns)
+            rows = []
+            values = []
+            for i, record in enumerate(records):
+                offset = i * width
+                rows.append("(" + ", ".join(f"${offset + j + 1}" for j in range(width)) + ")")
+                values.extend(record)
+
+            query = f"""
+                INSERT INTO api_usage ({', '.join(columns)})
+                VALUES {', '.join(rows)}
+            """
+
+            await db_manager.execute_query(query, *values)
+
+            return len(records)
+
+        except Exception as e:
+            logger.error(f"Failed to bulk insert API usage records: {e}")
+            return 0
+
     async def get_usage_by_user(
         self, 
         user_id: str, 
@@ -329,18 +399,7 @@ class APIUsageRepository(BaseRepository[APIUsageRecord]):
             result = await db_manager.execute_query(query, user_id, cutoff_time, fetch_one=True)
             
             if result:
-                total_requests = result['total_requests']
-                return {
-                    'total_requests': total_requests,
-                    'avg_response_time': float(result['avg_response_time']) if result['avg_response_time'] else 0.0,
-                    'success_count': result['success_count'],
-                    'error_count': result['error_count'],
-                    'rate_limit_hits': result['rate_limit_hits'],
-                    'api_key_requests': result['api_key_requests'],
-                    'unique_endpoints': result['unique_endpoints'],
-                    'success_rate': (result['success_count'] / total_requests * 100) if total_requests > 0 else 0.0,
-                    'hours_analyzed': hours_back
-                }
+                return user_statistics_from_row(result, hours_back)
             
             return {}
             
@@ -1,7 +1,8 @@
 """Repository for solar flare predictions data access."""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timedelta
+import asyncio
 import logging
 from app.repositories.base import BaseRepository
 from app.models.core import PredictionResult, SeverityLevel
@@ -111,6 +112,73 @@ class PredictionsRepository(BaseRepository[PredictionResult]):
             logger.error(f"Failed to get predictions by time range: {e}")
             return []
     
+    async def query_predictions(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        severity: Optional[SeverityLevel] = None,
+        min_probability: Optional[float] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> Tuple[List[PredictionResult], int]:
+        """
+        Get one page of filtered predictions plus the total match count.
+        
+        Filtering and pagination run in the database; the page and the
+        count are fetched concurrently on separate connections.
+        
+        Args:
+            start_time: Start of time range
+            end_time: End of time range
+            severity: Optional severity level to filter by
+            min_probability: Optional minimum probability threshold
+            limit: Maximum number of predictions to return
+            offset: Number of matching predictions to skip
+            
+        Returns:
+            Tuple of (PredictionResult page, total matching count)
+        """
+        try:
+            db_manager = await self._get_db_manager()
+            
+            conditions = ["timestamp >= $1", "timestamp <= $2"]
+            params: List[Any] = [start_time, end_time]
+            
+            if severity:
+                params.append(severity.value)
+                conditions.append(f"severity_level = ${len(params)}")
+            
+            if min_probability is not None:
+                params.append(min_probability)
+                conditions.append(f"flare_probability >= ${len(params)}")
+            
+            where_clause = " AND ".join(conditions)
+            count_query = f"SELECT COUNT(*) as count FROM predictions WHERE {where_clause}"
+            
+            query = f"SELECT * FROM predictions WHERE {where_clause} ORDER BY timestamp DESC"
+            page_params = list(params)
+            
+            if limit is not None:
+                page_params.append(limit)
+                query += f" LIMIT ${len(page_params)}"
+            
+            if offset:
+                page_params.append(offset)
+                query += f" OFFSET ${len(page_params)}"
+            
+            results, count_result = await asyncio.gather(
+                db_manager.execute_query(query, *page_params, fetch_all=True),
+                db_manager.execute_query(count_query, *params, fetch_one=True)
+            )
+            
+            total_count = count_result['count'] if count_result else 0
+            
+            return [self._row_to_model(row) for row in results], total_count
+            
+        except Exception as e:
+            logger.error(f"Failed to query predictions: {e}")
+            return [], 0
+    
     async def get_predictions_last_24_hours(self) -> List[PredictionResult]:
         """
         Get all predictions from the last 24 hours.
@@ -255,6 +323,34 @@ class PredictionsRepository(BaseRepository[PredictionResult]):
             logger.error(f"Failed to get prediction statistics: {e}")
             return {}
     
+    async def get_aggregated_statistics(
+        self,
+        hours_back: int = 24,
+        include_hourly: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Get prediction statistics, optionally with the hourly breakdown.
+        
+        Both aggregates run in the database; when the hourly breakdown is
+        requested the two queries are issued concurrently.
+        
+        Args:
+            hours_back: Number of hours to analyze
+            include_hourly: Whether to add the hourly breakdown
+            
+        Returns:
+            Dictionary with prediction statistics
+        """
+        if not include_hourly:
+            return await self.get_prediction_statistics(hours_back=hours_back)
+        
+        stats, hourly_counts = await asyncio.gather(
+            self.get_prediction_statistics(hours_back=hours_back),
+            self.get_hourly_prediction_counts(hours_back=hours_back)
+        )
+        stats["hourly_breakdown"] = hourly_counts
+        return stats
+    
     async def delete_old_predictions(self, days_to_keep: int = 30) -> int:
         """
         Delete predictions older than specified days.
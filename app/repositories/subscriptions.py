@@ -1,9 +1,10 @@
 """Repository for user subscriptions data access."""
 
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import logging
 from app.repositories.base import BaseRepository
+from app.repositories.api_usage import user_statistics_from_row
 from app.models.core import UserSubscription, SubscriptionTier
 
 logger = logging.getLogger(__name__)
@@ -65,6 +66,49 @@ class SubscriptionsRepository(BaseRepository[UserSubscription]):
         """
         return await self.find_one_by_field('user_id', user_id)
     
+    async def get_profile_bundle(
+        self,
+        user_id: str,
+        hours_back: int = 24,
+        default_thresholds: Optional[Dict[str, float]] = None
+    ) -> Optional[Tuple[UserSubscription, Dict[str, Any]]]:
+        """
+        Get a user's subscription and usage statistics in one query.
+        
+        Args:
+            user_id: User ID to look up
+            hours_back: Number of hours of usage to analyze
+            default_thresholds: If given, a free-tier subscription with these
+                alert thresholds is created when the user has none
+            
+        Returns:
+            Tuple of (UserSubscription, usage statistics) if found, None otherwise
+        """
+        try:
+            db_manager = await self._get_db_manager()
+            
+            query = "SELECT * FROM get_user_profile_bundle($1, $2, $3, $4)"
+            
+            row = await db_manager.execute_query(
+                query,
+                user_id,
+                datetime.utcnow() - timedelta(hours=hours_back),
+                default_thresholds,
+                default_thresholds is not None,
+                fetch_one=True
+            )
+            
+            if not row:
+                return None
+            
+            return self._row_to_model(row), user_statistics_from_row(row, hours_back)
+            
+        except Exception as e:
+            # Callers treat None as a missing subscription; a failed query
+            # must surface as an error instead
+            logger.error(f"Failed to get profile bundle: {e}")
+            raise
+    
     async def get_by_api_key_hash(self, api_key_hash: str) -> Optional[UserSubscription]:
         """
         Get subscription by API key hash.
@@ -195,7 +239,8 @@ class SubscriptionsRepository(BaseRepository[UserSubscription]):
         self, 
         user_id: str, 
         new_tier: SubscriptionTier,
-        razorpay_subscription_id: Optional[str] = None
+        razorpay_subscription_id: Optional[str] = None,
+        subscription: Optional[UserSubscription] = None
     ) -> Optional[UserSubscription]:
         """
         Update user's subscription tier.
@@ -204,12 +249,15 @@ class SubscriptionsRepository(BaseRepository[UserSubscription]):
             user_id: User ID to update
             new_tier: New subscription tier
             razorpay_subscription_id: Optional Razorpay subscription ID
+            subscription: The user's subscription, if the caller already
+                fetched it; saves a lookup
             
         Returns:
             Updated UserSubscription if successful, None otherwise
         """
         try:
-            subscription = await self.get_by_user_id(user_id)
+            if subscription is None:
+                subscription = await self.get_by_user_id(user_id)
             if not subscription:
                 logger.error(f"Subscription not found for user {user_id}")
                 return None
@@ -399,8 +447,7 @@ class SubscriptionsRepository(BaseRepository[UserSubscription]):
         """
         try:
             updates = {
-                'is_active': False if immediate else True,
-                'updated_at': datetime.utcnow()
+                'is_active': False if immediate else True
             }
             
             if immediate:
@@ -7,6 +7,7 @@ import secrets
 import hashlib
 from pydantic import BaseModel, EmailStr
 from fastapi import HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
 from supabase import Client
@@ -16,6 +17,8 @@ from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+API_KEY_PREFIX = "zc_"
+
 class AuthResponse(BaseModel):
     """Authentication response model."""
     success: bool
@@ -68,7 +71,7 @@ class AuthService:
         """
         try:
             # Sign up user with Supabase Auth
-            auth_response = self.client.auth.sign_up({
+            auth_response = await run_in_threadpool(self.client.auth.sign_up, {
                 "email": request.email,
                 "password": request.password,
                 "options": {
@@ -133,7 +136,7 @@ class AuthService:
         """
         try:
             # Sign in with Supabase Auth
-            auth_response = self.client.auth.sign_in_with_password({
+            auth_response = await run_in_threadpool(self.client.auth.sign_in_with_password, {
                 "email": request.email,
                 "password": request.password
             })
@@ -190,7 +193,7 @@ class AuthService:
         """
         try:
             # Get user from token
-            user_response = self.client.auth.get_user(access_token)
+            user_response = await run_in_threadpool(self.client.auth.get_user, access_token)
             
             if user_response.user:
                 # Get user subscription details
@@ -230,7 +233,7 @@ class AuthService:
             AuthResponse with new tokens or error
         """
         try:
-            auth_response = self.client.auth.refresh_session(refresh_token)
+            auth_response = await run_in_threadpool(self.client.auth.refresh_session, refresh_token)
             
             if auth_response.session:
                 return AuthResponse(
@@ -278,7 +281,7 @@ class AuthService:
             True if sign out successful, False otherwise
         """
         try:
-            self.client.auth.sign_out()
+            await run_in_threadpool(self.client.auth.sign_out)
             logger.info("User signed out successfully")
             return True
         except Exception as e:
@@ -301,10 +304,9 @@ class AuthService:
             api_key_hash = hashlib.sha256(api_key.encode()).hexdigest()
             
             # Update user subscription with API key hash
-            result = self.service_client.table("user_subscriptions").update({
-                "api_key_hash": api_key_hash,
-                "updated_at": datetime.utcnow().isoformat()
-            }).eq("user_id", user_id).execute()
+            result = await run_in_threadpool(self.service_client.table("user_subscriptions").update({
+                "api_key_hash": api_key_hash
+            }).eq("user_id", user_id).execute)
             
             if result.data:
                 logger.info(f"API key generated for user: {user_id}")
@@ -330,15 +332,18 @@ class AuthService:
             api_key_hash = hashlib.sha256(api_key.encode()).hexdigest()
             
             # Query user subscription by API key hash
-            result = self.service_client.table("user_subscriptions").select(
+            result = await run_in_threadpool(self.service_client.table("user_subscriptions").select(
                 "user_id, tier, webhook_url, alert_thresholds, created_at"
-            ).eq("api_key_hash", api_key_hash).execute()
+            ).eq("api_key_hash", api_key_hash).execute)
             
             if result.data:
                 subscription = result.data[0]
                 
                 # Get user details
-                user_result = self.service_client.auth.admin.get_user_by_id(subscription["user_id"])
+                user_result = await run_in_threadpool(
+                    self.service_client.auth.admin.get_user_by_id,
+                    subscription["user_id"]
+                )
                 
                 if user_result.user:
                     return UserSession(
@@ -359,13 +364,12 @@ class AuthService:
     async def _create_user_subscription(self, user_id: str, email: str) -> None:
         """Create initial user subscription with free tier."""
         try:
-            self.service_client.table("user_subscriptions").insert({
+            # The auth.users trigger may already have created it
+            await run_in_threadpool(self.service_client.table("user_subscriptions").upsert({
                 "user_id": user_id,
                 "tier": "free",
-                "alert_thresholds": self.settings.default_alert_thresholds,
-                "created_at": datetime.utcnow().isoformat(),
-                "updated_at": datetime.utcnow().isoformat()
-            }).execute()
+                "alert_thresholds": dict(self.settings.default_alert_thresholds)
+            }, on_conflict="user_id", ignore_duplicates=True).execute)
             
             logger.info(f"Created free tier subscription for user: {email}")
             
@@ -376,9 +380,9 @@ class AuthService:
     async def _get_user_subscription(self, user_id: str) -> Dict[str, Any]:
         """Get user subscription details."""
         try:
-            result = self.service_client.table("user_subscriptions").select(
+            result = await run_in_threadpool(self.service_client.table("user_subscriptions").select(
                 "tier, api_key_hash, webhook_url, alert_thresholds, last_login"
-            ).eq("user_id", user_id).execute()
+            ).eq("user_id", user_id).execute)
             
             if result.data:
                 return result.data[0]
@@ -392,9 +396,9 @@ class AuthService:
     async def _update_last_login(self, user_id: str) -> None:
         """Update user's last login timestamp."""
         try:
-            self.service_client.table("user_subscriptions").update({
+            await run_in_threadpool(self.service_client.table("user_subscriptions").update({
                 "last_login": datetime.utcnow().isoformat()
-            }).eq("user_id", user_id).execute()
+            }).eq("user_id", user_id).execute)
             
         except Exception as e:
             logger.warning(f"Failed to update last login: {e}")
@@ -428,12 +432,18 @@ async def get_current_user(
     from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
     
     try:
-        # Try JWT token first
-        user_session = await auth_service.validate_token(credentials.credentials)
+        token = credentials.credentials
         
-        if not user_session:
-            # Try API key authentication
-            user_session = await auth_service.validate_api_key(credentials.credentials)
+        if token.startswith(API_KEY_PREFIX):
+            # Our API keys are never JWTs; skip the token round trip
+            user_session = await auth_service.validate_api_key(token)
+        else:
+            # Try JWT token first
+            user_session = await auth_service.validate_token(token)
+            
+            if not user_session:
+                # Try API key authentication
+                user_session = await auth_service.validate_api_key(token)
         
         if not user_session:
             raise HTTPException(
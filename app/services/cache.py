@@ -4,8 +4,10 @@ Handles caching for NASA API responses and rate limiting
 """
 
 import json
+import math
+import time
 import structlog
-from typing import Optional, Any, Union
+from typing import Optional, Any, Union, Tuple
 from datetime import datetime
 
 logger = structlog.get_logger()
@@ -19,6 +21,40 @@ except ImportError:
     logger.warning("redis_not_available", message="Using in-memory cache fallback")
 
 
+# Atomic token-bucket refill + consume. State is two numbers per key:
+# the current token count and the timestamp of the last refill.
+# ARGV[5] debits tokens already spent elsewhere (e.g. by an in-process
+# bucket) and ARGV[6] is how many tokens this call tries to take.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local ttl_ms = tonumber(ARGV[4])
+local spent = tonumber(ARGV[5])
+local take = tonumber(ARGV[6])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+    tokens = burst
+    ts = now
+end
+
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+tokens = math.max(0, tokens - spent)
+local allowed = 0
+if tokens >= take then
+    tokens = tokens - take
+    allowed = 1
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], ttl_ms)
+return {allowed, tostring(tokens)}
+"""
+
+
 class InMemoryCache:
     """Fallback in-memory cache when Redis is not available"""
     
@@ -52,6 +88,32 @@ class InMemoryCache:
     async def expire(self, key: str, seconds: int):
         self._expiry[key] = datetime.utcnow().timestamp() + seconds
     
+    async def token_bucket(
+        self,
+        key: str,
+        rate: float,
+        burst: int,
+        now: float,
+        ttl: float,
+        spent: int = 0,
+        take: int = 1
+    ) -> Tuple[bool, float]:
+        """In-process equivalent of TOKEN_BUCKET_SCRIPT"""
+        state = await self.get(key)
+        if state is None:
+            tokens, ts = float(burst), now
+        else:
+            tokens, ts = state
+        
+        tokens = min(float(burst), tokens + max(0.0, now - ts) * rate)
+        tokens = max(0.0, tokens - spent)
+        allowed = tokens >= take
+        if allowed:
+            tokens -= take
+        
+        await self.set(key, (tokens, now), ttl)
+        return allowed, tokens
+    
     async def close(self):
         pass
 
@@ -70,6 +132,7 @@ class CacheService:
         self.redis_url = redis_url
         self._client: Optional[Union[redis.Redis, InMemoryCache]] = None
         self._connected = False
+        self._token_bucket_script = None
     
     async def connect(self):
         """Initialize connection to Redis or fallback"""
@@ -144,6 +207,16 @@ class CacheService:
         except Exception as e:
             logger.error("cache_delete_error", key=key, error=str(e))
     
+    @staticmethod
+    def _rate_limit_key(user_id: str, window: str, now: datetime) -> Tuple[str, int]:
+        """Return (key, ttl) for a fixed rate-limit window"""
+        if window == "day":
+            return f"rate_limit:{user_id}:{now.strftime('%Y-%m-%d')}", 86400
+        elif window == "hour":
+            return f"rate_limit:{user_id}:{now.strftime('%Y-%m-%d-%H')}", 3600
+        else:
+            return f"rate_limit:{user_id}:{now.strftime('%Y-%m-%d-%H-%M')}", 60
+    
     async def increment_rate_limit(self, user_id: str, window: str = "day") -> int:
         """
         Increment and return request count for rate limiting
@@ -157,16 +230,7 @@ class CacheService:
         """
         await self._ensure_connected()
         
-        now = datetime.utcnow()
-        if window == "day":
-            key = f"rate_limit:{user_id}:{now.strftime('%Y-%m-%d')}"
-            ttl = 86400
-        elif window == "hour":
-            key = f"rate_limit:{user_id}:{now.strftime('%Y-%m-%d-%H')}"
-            ttl = 3600
-        else:
-            key = f"rate_limit:{user_id}:{now.strftime('%Y-%m-%d-%H-%M')}"
-            ttl = 60
+        key, ttl = self._rate_limit_key(user_id, window, datetime.utcnow())
         
         try:
             if isinstance(self._client, InMemoryCache):
@@ -183,17 +247,57 @@ class CacheService:
             logger.error("rate_limit_increment_error", user_id=user_id, error=str(e))
             return 0
     
+    async def token_bucket_consume(
+        self,
+        user_id: str,
+        endpoint_type: str,
+        rate: float,
+        burst: int,
+        spent: int = 0,
+        take: int = 1
+    ) -> Tuple[bool, float]:
+        """
+        Refill and try to take tokens from the user's bucket
+        
+        Args:
+            user_id: User identifier
+            endpoint_type: Bucket name, e.g. 'alerts' or 'history'
+            rate: Refill rate in tokens per second
+            burst: Bucket capacity
+            spent: Tokens already spent elsewhere, debited unconditionally
+            take: Tokens this call tries to take
+            
+        Returns:
+            (allowed, tokens left after this request)
+        """
+        await self._ensure_connected()
+        
+        key = f"token_bucket:{user_id}:{endpoint_type}"
+        now = time.time()
+        # Idle buckets refill completely, so they can expire once full
+        ttl = math.ceil(burst / rate) if rate > 0 else 86400
+        
+        try:
+            if isinstance(self._client, InMemoryCache):
+                return await self._client.token_bucket(key, rate, burst, now, ttl, spent, take)
+            
+            if self._token_bucket_script is None:
+                self._token_bucket_script = self._client.register_script(TOKEN_BUCKET_SCRIPT)
+            
+            allowed, tokens = await self._token_bucket_script(
+                keys=[key],
+                args=[rate, burst, now, ttl * 1000, spent, take]
+            )
+            return bool(int(allowed)), float(tokens)
+        except Exception as e:
+            logger.error("token_bucket_error", user_id=user_id, endpoint_type=endpoint_type, error=str(e))
+            return True, float(burst)
+    
     async def get_rate_limit_count(self, user_id: str, window: str = "day") -> int:
         """Get current rate limit count for user"""
         await self._ensure_connected()
         
-        now = datetime.utcnow()
-        if window == "day":
-            key = f"rate_limit:{user_id}:{now.strftime('%Y-%m-%d')}"
-        elif window == "hour":
-            key = f"rate_limit:{user_id}:{now.strftime('%Y-%m-%d-%H')}"
-        else:
-            key = f"rate_limit:{user_id}:{now.strftime('%Y-%m-%d-%H-%M')}"
+        key, _ = self._rate_limit_key(user_id, window, datetime.utcnow())
         
         try:
             if isinstance(self._client, InMemoryCache):
@@ -5,11 +5,30 @@ import logging
 from typing import Optional, Dict, Any, List
 from contextlib import asynccontextmanager
 import asyncpg
+import orjson
 from asyncpg import Pool, Connection
 from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Binary jsonb is the JSON text behind a one-byte format version
+_JSONB_VERSION = b"\x01"
+
+
+def _encode_json(value: Any) -> bytes:
+    """Encode a value for a binary-format json parameter."""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _encode_jsonb(value: Any) -> bytes:
+    """Encode a value for a binary-format jsonb parameter."""
+    return _JSONB_VERSION + orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _decode_jsonb(data: bytes) -> Any:
+    """Decode a binary-format jsonb value, skipping its version byte."""
+    return orjson.loads(memoryview(data)[1:])
+
 
 class DatabaseManager:
     """Manages database connections and operations."""
@@ -57,6 +76,7 @@ class DatabaseManager:
                 min_size=min_size,
                 max_size=max_size,
                 command_timeout=60,
+                init=self._init_connection,
                 **self._connection_params
             )
             logger.info(f"Database pool initialized with {min_size}-{max_size} connections")
@@ -65,6 +85,24 @@ class DatabaseManager:
             logger.error(f"Failed to initialize database pool: {e}")
             raise
     
+    @staticmethod
+    async def _init_connection(conn: Connection) -> None:
+        """Encode and decode JSON columns as Python objects with orjson."""
+        await conn.set_type_codec(
+            "jsonb",
+            encoder=_encode_jsonb,
+            decoder=_decode_jsonb,
+            schema="pg_catalog",
+            format="binary"
+        )
+        await conn.set_type_codec(
+            "json",
+            encoder=_encode_json,
+            decoder=orjson.loads,
+            schema="pg_catalog",
+            format="binary"
+        )
+    
     async def close_pool(self) -> None:
         """Close the database connection pool."""
         if self._pool:
@@ -233,6 +271,47 @@ class DatabaseManager:
         return result['count'] if result else 0
 
 
+class HealthCheckPool:
+    """
+    Small dedicated connection pool for health probes.
+    
+    Probes must not queue behind application traffic: when the main pool
+    is exhausted is exactly when a probe needs an answer.
+    """
+    
+    def __init__(self, connection_params: Dict[str, Any]):
+        self._pool: Optional[Pool] = None
+        self._connection_params = connection_params
+    
+    async def initialize(self, min_size: int = 1, max_size: int = 2) -> None:
+        """Create the probe pool; a missing DSN leaves it uninitialized."""
+        if not self._connection_params:
+            logger.warning("No database connection parameters available for health checks")
+            return
+        
+        self._pool = await asyncpg.create_pool(
+            min_size=min_size,
+            max_size=max_size,
+            command_timeout=5,
+            **self._connection_params
+        )
+        logger.info(f"Health check pool initialized with {min_size}-{max_size} connections")
+    
+    async def close(self) -> None:
+        """Close the probe pool."""
+        if self._pool:
+            await self._pool.close()
+            self._pool = None
+    
+    async def fetch_one(self, query: str, *args) -> Optional[Dict[str, Any]]:
+        """Run a query on a probe connection and return the first row."""
+        if not self._pool:
+            raise RuntimeError("Health check pool not initialized")
+        
+        row = await self._pool.fetchrow(query, *args)
+        return dict(row) if row else None
+
+
 class MigrationManager:
     """Manages database migrations."""
     
@@ -336,6 +415,7 @@ class MigrationManager:
 # Global database manager instance
 db_manager = DatabaseManager()
 migration_manager = MigrationManager(db_manager)
+health_check_pool = HealthCheckPool(db_manager._connection_params)
 
 
 async def get_database_manager() -> DatabaseManager:
@@ -343,6 +423,11 @@ async def get_database_manager() -> DatabaseManager:
     return db_manager
 
 
+async def get_health_check_pool() -> HealthCheckPool:
+    """Get the global health check pool instance."""
+    return health_check_pool
+
+
 async def get_migration_manager() -> MigrationManager:
     """Get the global migration manager instance."""
     return migration_manager
@@ -0,0 +1,74 @@
+"""
+In-process token buckets for rate limiting
+Per-user buckets are kept in a bounded LRU and periodically reconciled
+with the shared bucket in the cache service
+"""
+
+from collections import OrderedDict
+from typing import Optional
+
+
+class LocalTokenBucket:
+    """Token bucket state for a single user"""
+
+    __slots__ = ("tokens", "ts", "pending", "synced_at")
+
+    def __init__(self, tokens: float, now: float):
+        self.tokens = tokens
+        self.ts = now
+        # Tokens spent locally since the last sync with the shared bucket
+        self.pending = 0
+        self.synced_at = 0.0
+
+    def consume(self, rate: float, burst: int, now: float) -> bool:
+        """Refill for elapsed time and try to take one token"""
+        self.tokens = min(float(burst), self.tokens + max(0.0, now - self.ts) * rate)
+        self.ts = now
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.pending += 1
+            return True
+        return False
+
+    def sync(self, tokens: float, now: float):
+        """Adopt the authoritative token count from the shared bucket"""
+        self.tokens = tokens
+        self.ts = now
+        self.pending = 0
+        self.synced_at = now
+
+
+class LocalBucketStore:
+    """Bounded LRU of per-user token buckets"""
+
+    def __init__(self, max_size: int = 100_000):
+        self.max_size = max_size
+        self._buckets: "OrderedDict[str, LocalTokenBucket]" = OrderedDict()
+
+    def get(self, key: str, burst: int, now: float) -> LocalTokenBucket:
+        """Get the bucket for key, creating a full one if missing"""
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = LocalTokenBucket(float(burst), now)
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_size:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+# Singleton instance
+_bucket_store: Optional[LocalBucketStore] = None
+
+
+def get_local_bucket_store() -> LocalBucketStore:
+    """Get or create local bucket store singleton"""
+    global _bucket_store
+    if _bucket_store is None:
+        _bucket_store = LocalBucketStore()
+    return _bucket_store
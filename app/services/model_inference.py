@@ -451,6 +451,17 @@ class ModelInferenceService:
 
 # Global model instance
 _model_engine: Optional[ModelInferenceEngine] = None
+_model_service: Optional[ModelInferenceService] = None
+
+
+async def get_model_service() -> ModelInferenceService:
+    """Get or create the global model inference service instance."""
+    global _model_service
+    
+    if _model_service is None:
+        _model_service = ModelInferenceService()
+    
+    return _model_service
 
 
 async def get_model_engine() -> ModelInferenceEngine:
@@ -1,11 +1,14 @@
 """System monitoring and alerting service."""
 
 import asyncio
+import bisect
 import time
+from collections import deque
+import numpy as np
 import psutil
 import os
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Callable
+from typing import Dict, List, Any, Optional, Callable, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -72,6 +75,80 @@ class MonitoringThresholds:
     websocket_connection_limit: int = 1000  # Max WebSocket connections
 
 
+# Usage series tracked for summaries, in tuple order
+_USAGE_RESOURCES = ("cpu", "memory", "disk")
+
+
+class RollingAggregate:
+    """
+    Sliding-window avg/min/max of CPU, memory and disk usage.
+    
+    Sums are updated as samples enter and leave the window; min/max use
+    monotonic deques, so both adding and reading are amortized O(1).
+    """
+    
+    def __init__(self, window: float):
+        self.window = window
+        # (sequence, epoch time, usage values, ISO timestamp)
+        self._samples: deque = deque()
+        self._sums = [0.0, 0.0, 0.0]
+        # Per resource: (sequence, value) with values increasing / decreasing
+        self._mins = [deque(), deque(), deque()]
+        self._maxs = [deque(), deque(), deque()]
+        self._seq = 0
+    
+    def add(self, at: float, values: Tuple[float, float, float], timestamp: str) -> None:
+        """Add a (cpu, memory, disk) usage sample taken at epoch time `at`."""
+        seq = self._seq
+        self._seq += 1
+        self._samples.append((seq, at, values, timestamp))
+        
+        for i, value in enumerate(values):
+            self._sums[i] += value
+            mins, maxs = self._mins[i], self._maxs[i]
+            while mins and mins[-1][1] >= value:
+                mins.pop()
+            mins.append((seq, value))
+            while maxs and maxs[-1][1] <= value:
+                maxs.pop()
+            maxs.append((seq, value))
+        
+        self._evict(at)
+    
+    def _evict(self, now: float) -> None:
+        """Drop samples older than the window."""
+        cutoff = now - self.window
+        samples = self._samples
+        while samples and samples[0][1] < cutoff:
+            seq, _, values, _ = samples.popleft()
+            for i, value in enumerate(values):
+                self._sums[i] -= value
+                if self._mins[i][0][0] == seq:
+                    self._mins[i].popleft()
+                if self._maxs[i][0][0] == seq:
+                    self._maxs[i].popleft()
+    
+    def summary(self, now: float) -> Optional[Dict[str, Any]]:
+        """Summary of the samples in the window ending at `now`, or None if empty."""
+        self._evict(now)
+        count = len(self._samples)
+        if not count:
+            return None
+        
+        summary: Dict[str, Any] = {
+            resource: {
+                "avg": self._sums[i] / count,
+                "min": self._mins[i][0][1],
+                "max": self._maxs[i][0][1]
+            }
+            for i, resource in enumerate(_USAGE_RESOURCES)
+        }
+        summary["data_points"] = count
+        summary["period_start"] = self._samples[0][3]
+        summary["period_end"] = self._samples[-1][3]
+        return summary
+
+
 class SystemMonitor:
     """System performance and health monitor."""
     
@@ -80,6 +157,14 @@ class SystemMonitor:
         self.active_alerts: Dict[str, Alert] = {}
         self.alert_history: List[Alert] = []
         self.metrics_history: List[Dict[str, Any]] = []
+        # Epoch seconds and (cpu, memory, disk) usage of each metrics_history
+        # entry, in the same order
+        self.metrics_timestamps: List[float] = []
+        self.metrics_usage: List[Tuple[float, float, float]] = []
+        # Running summaries over standard windows, in seconds
+        self.metrics_windows: Dict[int, RollingAggregate] = {
+            window: RollingAggregate(window) for window in (60, 300, 3600, 86400)
+        }
         self.alert_callbacks: List[Callable[[Alert], None]] = []
         self._monitoring_task: Optional[asyncio.Task] = None
         self._is_monitoring = False
@@ -134,12 +219,24 @@ class SystemMonitor:
         
         try:
             # Collect system metrics
-            metrics = await self._collect_system_metrics()
+            collected_at, metrics = await self._collect_system_metrics()
             
             # Store metrics history (keep last 1000 entries)
+            usage = (
+                metrics["cpu"]["usage_percent"],
+                metrics["memory"]["usage_percent"],
+                metrics["disk"]["usage_percent"]
+            )
             self.metrics_history.append(metrics)
+            self.metrics_timestamps.append(collected_at)
+            self.metrics_usage.append(usage)
             if len(self.metrics_history) > 1000:
                 self.metrics_history.pop(0)
+                self.metrics_timestamps.pop(0)
+                self.metrics_usage.pop(0)
+            
+            for aggregate in self.metrics_windows.values():
+                aggregate.add(collected_at, usage, metrics["timestamp"])
             
             # Check thresholds and trigger alerts
             await self._check_thresholds(metrics)
@@ -162,11 +259,12 @@ class SystemMonitor:
             )
             raise
     
-    async def _collect_system_metrics(self) -> Dict[str, Any]:
-        """Collect current system performance metrics."""
+    async def _collect_system_metrics(self) -> Tuple[float, Dict[str, Any]]:
+        """Collect current system performance metrics, with their epoch collection time."""
         try:
             # CPU metrics
             cpu_percent = psutil.cpu_percent(interval=1)
+            collected_at = time.time()
             cpu_count = psutil.cpu_count()
             load_avg = list(os.getloadavg()) if hasattr(os, 'getloadavg') else None
             
@@ -192,8 +290,8 @@ class SystemMonitor:
             except Exception:
                 network_stats = None
             
-            return {
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+            return collected_at, {
+                "timestamp": datetime.utcfromtimestamp(collected_at).isoformat() + "Z",
                 "cpu": {
                     "usage_percent": cpu_percent,
                     "count": cpu_count,
@@ -354,14 +452,87 @@ class SystemMonitor:
         """Get list of active alerts."""
         return list(self.active_alerts.values())
     
-    def get_alert_history(self, limit: int = 100) -> List[Alert]:
-        """Get alert history."""
-        return self.alert_history[-limit:]
+    @property
+    def active_alert_count(self) -> int:
+        """Number of active alerts, without copying them."""
+        return len(self.active_alerts)
+    
+    def get_alert_history(
+        self,
+        limit: int = 100,
+        severity: Optional[AlertSeverity] = None,
+        alert_type: Optional[AlertType] = None,
+        active_only: bool = False
+    ) -> List[Alert]:
+        """
+        Get the most recent alerts matching the filters, oldest first.
+        
+        With active_only, only currently active alerts are considered.
+        """
+        source = self.active_alerts.values() if active_only else self.alert_history
+        if severity is None and alert_type is None:
+            return list(source)[-limit:]
+        
+        # Walk newest-first and stop once `limit` matches are found
+        matches = []
+        for alert in reversed(list(source) if active_only else source):
+            if severity is not None and alert.severity != severity:
+                continue
+            if alert_type is not None and alert.type != alert_type:
+                continue
+            matches.append(alert)
+            if len(matches) == limit:
+                break
+        matches.reverse()
+        return matches
     
     def get_metrics_history(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get metrics history."""
         return self.metrics_history[-limit:]
     
+    def get_window_summary(self, window: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the precomputed usage summary for a standard window.
+        
+        Returns None if the window is not precomputed or holds no samples.
+        """
+        aggregate = self.metrics_windows.get(window)
+        if aggregate is None:
+            return None
+        return aggregate.summary(time.time())
+    
+    def summarize_metrics_since(self, since: float) -> Optional[Dict[str, Any]]:
+        """
+        Summarize usage over the history collected at or after `since`.
+        
+        Returns None if no samples fall in the range.
+        """
+        start = bisect.bisect_left(self.metrics_timestamps, since)
+        if start == len(self.metrics_usage):
+            return None
+        
+        # Usage values are extracted at sample time, so this is a single
+        # (N, 3) array build and three column-wise reductions
+        usage = np.array(self.metrics_usage[start:], dtype=np.float64)
+        means = usage.mean(axis=0).tolist()
+        mins = usage.min(axis=0).tolist()
+        maxs = usage.max(axis=0).tolist()
+        
+        summary: Dict[str, Any] = {
+            resource: {"avg": means[i], "min": mins[i], "max": maxs[i]}
+            for i, resource in enumerate(_USAGE_RESOURCES)
+        }
+        summary["data_points"] = len(usage)
+        summary["period_start"] = self.metrics_history[start]["timestamp"]
+        summary["period_end"] = self.metrics_history[-1]["timestamp"]
+        return summary
+    
+    def get_metrics_window(self, since: float) -> Tuple[List[float], List[Dict[str, Any]]]:
+        """Get (epoch timestamps, metrics) collected at or after the given epoch time."""
+        # History is appended in time order, so the cutoff is a binary search
+        start = bisect.bisect_left(self.metrics_timestamps, since)
+        return self.metrics_timestamps[start:], self.metrics_history[start:]
+    
     async def trigger_custom_alert(
         self,
         alert_type: AlertType,
@@ -1,6 +1,8 @@
 """Razorpay payment processing service."""
 
 import razorpay
+import requests
+from requests.adapters import HTTPAdapter
 import hmac
 import hashlib
 from typing import Dict, Any, Optional, List
@@ -23,21 +25,35 @@ class RazorpayService:
             logger.warning("Razorpay credentials not configured")
             self.client = None
             self.webhook_secret = None
+            self._webhook_key = None
             return
             
+        # One pooled keep-alive session for all Razorpay API calls, so
+        # requests reuse connections instead of repeating TLS handshakes
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=100))
+        
         self.client = razorpay.Client(
+            session=session,
             auth=(
                 settings.external.razorpay_key_id,
                 settings.external.razorpay_key_secret
             )
         )
         self.webhook_secret = settings.external.razorpay_webhook_secret
+        # Encoded once; every webhook verification keys an HMAC with it
+        self._webhook_key = self.webhook_secret.encode('utf-8') if self.webhook_secret else None
         self.settings = settings
         
     def is_configured(self) -> bool:
         """Check if Razorpay is properly configured."""
         return self.client is not None
     
+    def close(self) -> None:
+        """Close pooled connections to the Razorpay API."""
+        if self.client is not None:
+            self.client.session.close()
+    
     async def create_subscription_plan(self, tier: SubscriptionTier) -> Dict[str, Any]:
         """Create a subscription plan in Razorpay for a given tier."""
         if not self.is_configured():
@@ -198,20 +214,28 @@ class RazorpayService:
             )
             raise
     
-    async def verify_webhook_signature(self, payload: bytes, signature: str) -> bool:
-        """Verify Razorpay webhook signature."""
+    def webhook_verifier(self) -> Optional["hmac.HMAC"]:
+        """Start an incremental webhook HMAC; feed it body chunks with update()."""
         if not self.webhook_secret:
             logger.warning("Webhook secret not configured")
+            return None
+        
+        return hmac.new(self._webhook_key, digestmod=hashlib.sha256)
+    
+    @staticmethod
+    def webhook_signature_matches(verifier: "hmac.HMAC", signature: str) -> bool:
+        """Check a fully fed webhook verifier against the received signature."""
+        return hmac.compare_digest(signature, verifier.hexdigest())
+    
+    async def verify_webhook_signature(self, payload: bytes, signature: str) -> bool:
+        """Verify Razorpay webhook signature."""
+        verifier = self.webhook_verifier()
+        if verifier is None:
             return False
             
         try:
-            expected_signature = hmac.new(
-                self.webhook_secret.encode('utf-8'),
-                payload,
-                hashlib.sha256
-            ).hexdigest()
-            
-            return hmac.compare_digest(signature, expected_signature)
+            verifier.update(payload)
+            return self.webhook_signature_matches(verifier, signature)
             
         except Exception as e:
             logger.error("Failed to verify webhook signature", error=str(e))
@@ -359,6 +383,6 @@ class RazorpayService:
 razorpay_service = RazorpayService()
 
 
-def get_razorpay_service() -> RazorpayService:
+async def get_razorpay_service() -> RazorpayService:
     """Get Razorpay service instance."""
     return razorpay_service
\ No newline at end of file
@@ -0,0 +1,136 @@
+"""Background batch writer for API usage records."""
+
+import asyncio
+import logging
+from typing import List, Optional
+
+from app.repositories.api_usage import UsageRecord, get_api_usage_repository
+
+logger = logging.getLogger(__name__)
+
+# Queued by stop() so the drain loop flushes its current batch and exits
+_STOP = object()
+
+
+class UsageLogger:
+    """
+    Buffers API usage records in memory and writes them in batches.
+
+    Request handlers call `log()`, which never awaits; a single background
+    task drains the queue and inserts up to `batch_size` rows per round-trip,
+    flushing at least every `flush_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int = 10_000,
+        batch_size: int = 256,
+        flush_interval: float = 0.5
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue_size)
+        self._task: Optional[asyncio.Task] = None
+        self._is_running = False
+        self._dropped = 0
+
+    def log(self, record: UsageRecord) -> None:
+        """Enqueue a usage record; drops it if the queue is full."""
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            self._dropped += 1
+            logger.warning(f"Usage log queue full, dropped record ({self._dropped} dropped so far)")
+
+    async def start(self) -> None:
+        """Start the background writer task."""
+        if self._is_running:
+            logger.warning("Usage logger already running")
+            return
+
+        self._is_running = True
+        self._task = asyncio.create_task(self._drain_loop())
+        logger.info("Usage logger started")
+
+    async def stop(self) -> None:
+        """Stop the writer task and flush whatever is still queued."""
+        self._is_running = False
+        if self._task:
+            # Cancelling would lose the batch the loop is collecting or writing
+            if not self._task.done():
+                await self._queue.put(_STOP)
+                await self._task
+            self._task = None
+
+        remaining = []
+        while not self._queue.empty():
+            remaining.append(self._queue.get_nowait())
+
+        for start in range(0, len(remaining), self.batch_size):
+            await self._flush(remaining[start:start + self.batch_size])
+
+        logger.info("Usage logger stopped")
+
+    async def _drain_loop(self) -> None:
+        """Collect records into batches and write them."""
+        loop = asyncio.get_running_loop()
+
+        while True:
+            record = await self._queue.get()
+            if record is _STOP:
+                return
+            batch = [record]
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    record = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if record is _STOP:
+                    await self._flush(batch)
+                    return
+                batch.append(record)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[UsageRecord]) -> None:
+        """Write one batch, logging (not raising) on failure."""
+        if not batch:
+            return
+
+        try:
+            await get_api_usage_repository().bulk_create(batch)
+        except Exception as e:
+            logger.warning(f"Failed to write {len(batch)} API usage records: {e}")
+
+
+# Global usage logger instance
+_usage_logger: Optional[UsageLogger] = None
+
+
+def get_usage_logger() -> UsageLogger:
+    """Get or create the global usage logger instance."""
+    global _usage_logger
+
+    if _usage_logger is None:
+        _usage_logger = UsageLogger()
+
+    return _usage_logger
+
+
+async def initialize_usage_logger() -> None:
+    """Start the usage logger background writer."""
+    await get_usage_logger().start()
+
+
+async def shutdown_usage_logger() -> None:
+    """Stop the usage logger and flush pending records."""
+    global _usage_logger
+
+    if _usage_logger:
+        await _usage_logger.stop()
+        _usage_logger = None
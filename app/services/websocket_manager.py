@@ -8,6 +8,8 @@ from typing import Dict, Set, Optional, List, Any
 from uuid import uuid4
 import weakref
 
+import msgpack
+
 from fastapi import WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
 
@@ -16,6 +18,38 @@ from app.services.auth_service import AuthService, UserSession
 
 logger = logging.getLogger(__name__)
 
+# Per-client send timeout, in seconds
+SEND_TIMEOUT = 5.0
+
+# Outbound messages buffered per connection; past this the oldest are dropped
+OUTBOX_SIZE = 32
+
+# Subprotocol for clients that send msgpack-encoded binary frames
+MSGPACK_SUBPROTOCOL = "zerocomp.msgpack.v1"
+
+# Subprotocol for clients that accept several messages as one JSON array frame
+BATCH_SUBPROTOCOL = "zerocomp.batch.v1"
+
+SUBPROTOCOLS = (MSGPACK_SUBPROTOCOL, BATCH_SUBPROTOCOL)
+
+
+def frame_template(msg_type: str, data: Dict[str, Any]) -> str:
+    """
+    Serialize a fixed message once, leaving a %s slot for its timestamp.
+    
+    Fill it with `template % datetime.utcnow().isoformat()` to get the same
+    JSON WebSocketMessage.model_dump_json() would produce.
+    """
+    body = WebSocketMessage(type=msg_type, data=data).model_dump_json(exclude={"timestamp"})
+    return body[:-1].replace("%", "%%") + ',"timestamp":"%s"}'
+
+
+# Fixed messages sent on hot paths, serialized once at import
+HEARTBEAT_FRAME = frame_template("heartbeat", {"message": "Server heartbeat"})
+HEARTBEAT_ACK_FRAME = frame_template("heartbeat_ack", {"message": "Heartbeat acknowledged"})
+AUTH_ERROR_FRAME = frame_template("auth_error", {"message": "Authentication failed"})
+THRESHOLDS_ERROR_FRAME = frame_template("error", {"message": "Failed to update alert thresholds"})
+
 
 class ConnectionInfo(BaseModel):
     """Information about a WebSocket connection."""
@@ -28,6 +62,17 @@ class ConnectionInfo(BaseModel):
     is_authenticated: bool = False
 
 
+class ConnectionRelay:
+    """Outbound queue for one connection and the task that drains it."""
+    
+    # One per connection, so skip the per-instance __dict__
+    __slots__ = ("outbox", "task")
+    
+    def __init__(self, outbox: asyncio.Queue, task: Optional[asyncio.Task] = None):
+        self.outbox = outbox
+        self.task = task
+
+
 class WebSocketManager:
     """Manages WebSocket connections for real-time alerts."""
     
@@ -36,6 +81,7 @@ class WebSocketManager:
         self.connections: Dict[str, WebSocket] = {}
         self.connection_info: Dict[str, ConnectionInfo] = {}
         self.user_connections: Dict[str, Set[str]] = {}  # user_id -> set of connection_ids
+        self.relays: Dict[str, ConnectionRelay] = {}  # connection_id -> outbound queue and relay task
         self.heartbeat_interval = 30  # seconds
         self.connection_timeout = 300  # 5 minutes
         self._heartbeat_task: Optional[asyncio.Task] = None
@@ -75,7 +121,13 @@ class WebSocketManager:
         Returns:
             Connection ID for the new connection
         """
-        await websocket.accept()
+        # Clients opt into msgpack input or batched output by requesting a
+        # subprotocol; the first one they list that we support wins
+        subprotocol = next(
+            (p for p in websocket.scope.get("subprotocols", []) if p in SUBPROTOCOLS),
+            None
+        )
+        await websocket.accept(subprotocol=subprotocol)
         
         connection_id = str(uuid4())
         now = datetime.utcnow()
@@ -108,6 +160,14 @@ class WebSocketManager:
         self.connections[connection_id] = websocket
         self.connection_info[connection_id] = conn_info
         
+        # Sends go through a per-connection queue drained by its own task, so
+        # a slow client only backs up its own queue
+        relay = ConnectionRelay(asyncio.Queue(maxsize=OUTBOX_SIZE))
+        self.relays[connection_id] = relay
+        relay.task = asyncio.create_task(self._relay(
+            connection_id, websocket, relay.outbox, batch=subprotocol == BATCH_SUBPROTOCOL
+        ))
+        
         # Send welcome message
         welcome_msg = WebSocketMessage(
             type="connection",
@@ -145,6 +205,9 @@ class WebSocketManager:
             del self.connections[connection_id]
             if connection_id in self.connection_info:
                 del self.connection_info[connection_id]
+            relay = self.relays.pop(connection_id, None)
+            if relay and relay.task is not asyncio.current_task():
+                relay.task.cancel()
             
             logger.info(f"WebSocket connection disconnected: {connection_id}")
     
@@ -227,20 +290,37 @@ class WebSocketManager:
         await self._send_message(connection_id, update_msg)
         return True
     
-    async def broadcast_alert(self, alert_data: Dict[str, Any], severity: SeverityLevel):
+    async def broadcast_alert(self, alert_data: Dict[str, Any], severity: SeverityLevel) -> int:
         """
         Broadcast alert to all eligible connections based on their thresholds and subscription tiers.
         
         Args:
             alert_data: Alert data to broadcast
             severity: Alert severity level
+            
+        Returns:
+            Number of connections the alert was queued for
         """
         if not self.connections:
-            return
+            return 0
         
-        flare_probability = alert_data.get("flare_probability", 0.0)
+        return await self.broadcast_raw(
+            self.build_alert_payload(alert_data, severity),
+            severity,
+            alert_data.get("flare_probability", 0.0)
+        )
+    
+    def build_alert_payload(self, alert_data: Dict[str, Any], severity: SeverityLevel) -> str:
+        """
+        Serialize an alert message for broadcast_raw.
         
-        # Create alert message
+        Args:
+            alert_data: Alert data to broadcast
+            severity: Alert severity level
+            
+        Returns:
+            JSON text of the alert message
+        """
         alert_msg = WebSocketMessage(
             type="alert",
             data={
@@ -249,17 +329,33 @@ class WebSocketManager:
                 "alert_type": "solar_flare"
             }
         )
+        return alert_msg.model_dump_json()
+    
+    async def broadcast_raw(self, payload: str, severity: SeverityLevel, flare_probability: float) -> int:
+        """
+        Broadcast an already-serialized alert to all eligible connections.
+        
+        The same string is queued for every recipient, so the alert is
+        serialized once no matter how many clients are connected.
         
+        Args:
+            payload: JSON text of the alert message
+            severity: Alert severity level
+            flare_probability: Flare probability, checked against each connection's thresholds
+            
+        Returns:
+            Number of connections the alert was queued for
+        """
         broadcast_count = 0
         
         for connection_id, conn_info in self.connection_info.items():
             # Check if connection should receive this alert
             if self._should_receive_alert(conn_info, flare_probability, severity):
-                success = await self._send_message(connection_id, alert_msg)
-                if success:
+                if self._enqueue(connection_id, payload):
                     broadcast_count += 1
         
         logger.info(f"Broadcasted alert to {broadcast_count} connections (severity: {severity.value})")
+        return broadcast_count
     
     async def send_to_user(self, user_id: str, message: WebSocketMessage) -> int:
         """
@@ -292,6 +388,37 @@ class WebSocketManager:
         """
         try:
             data = json.loads(message)
+        except json.JSONDecodeError:
+            logger.error(f"Invalid JSON message from {connection_id}: {message}")
+            return
+        
+        await self._dispatch_message(connection_id, data)
+    
+    async def handle_message_binary(self, connection_id: str, message: bytes):
+        """
+        Handle incoming msgpack-encoded binary message from WebSocket client.
+        
+        Args:
+            connection_id: ID of the connection that sent the message
+            message: Raw message bytes
+        """
+        try:
+            data = msgpack.unpackb(message, raw=False)
+        except Exception:
+            logger.error(f"Invalid msgpack message from {connection_id} ({len(message)} bytes)")
+            return
+        
+        await self._dispatch_message(connection_id, data)
+    
+    async def _dispatch_message(self, connection_id: str, data: Dict[str, Any]):
+        """
+        Act on a decoded client message.
+        
+        Args:
+            connection_id: ID of the connection that sent the message
+            data: Decoded message
+        """
+        try:
             msg_type = data.get("type")
             
             if msg_type == "heartbeat":
@@ -301,28 +428,44 @@ class WebSocketManager:
                 if token:
                     success = await self.authenticate_connection(connection_id, token)
                     if not success:
-                        error_msg = WebSocketMessage(
-                            type="auth_error",
-                            data={"message": "Authentication failed"}
-                        )
-                        await self._send_message(connection_id, error_msg)
+                        await self.send_text(connection_id, AUTH_ERROR_FRAME % datetime.utcnow().isoformat())
             elif msg_type == "update_thresholds":
                 thresholds = data.get("thresholds", {})
                 success = await self.update_alert_thresholds(connection_id, thresholds)
                 if not success:
-                    error_msg = WebSocketMessage(
-                        type="error",
-                        data={"message": "Failed to update alert thresholds"}
-                    )
-                    await self._send_message(connection_id, error_msg)
+                    await self.send_text(connection_id, THRESHOLDS_ERROR_FRAME % datetime.utcnow().isoformat())
             else:
                 logger.warning(f"Unknown message type from {connection_id}: {msg_type}")
                 
-        except json.JSONDecodeError:
-            logger.error(f"Invalid JSON message from {connection_id}: {message}")
         except Exception as e:
             logger.error(f"Error handling message from {connection_id}: {e}")
     
+    async def send_message(self, connection_id: str, message: WebSocketMessage) -> bool:
+        """
+        Queue a message for a specific connection.
+        
+        Args:
+            connection_id: ID of the connection
+            message: Message to send
+            
+        Returns:
+            True if message was queued, False otherwise
+        """
+        return await self.send_text(connection_id, message.model_dump_json())
+    
+    async def send_text(self, connection_id: str, payload: str) -> bool:
+        """
+        Queue already-serialized JSON text for a specific connection.
+        
+        Args:
+            connection_id: ID of the connection
+            payload: JSON text to send
+            
+        Returns:
+            True if message was queued, False otherwise
+        """
+        return self._enqueue(connection_id, payload)
+    
     def get_connection_count(self) -> int:
         """Get total number of active connections."""
         return len(self.connections)
@@ -337,29 +480,90 @@ class WebSocketManager:
     
     async def _send_message(self, connection_id: str, message: WebSocketMessage) -> bool:
         """
-        Send message to a specific connection.
+        Queue a message for a specific connection.
         
         Args:
             connection_id: ID of the connection
             message: Message to send
             
         Returns:
-            True if message sent successfully, False otherwise
+            True if message was queued, False otherwise
         """
-        if connection_id not in self.connections:
+        return await self.send_text(connection_id, message.model_dump_json())
+    
+    def _enqueue(self, connection_id: str, payload: str) -> bool:
+        """
+        Put an already-serialized payload on a connection's outbox without waiting.
+        
+        If the outbox is full the oldest queued message is dropped to make
+        room, so memory per connection stays bounded and the newest alert
+        always goes out. A client that stops reading entirely is dropped by
+        its relay task once a send times out.
+        
+        Args:
+            connection_id: ID of the connection
+            payload: JSON text to send
+            
+        Returns:
+            True if queued, False if the connection is gone
+        """
+        relay = self.relays.get(connection_id)
+        if relay is None:
             return False
         
+        outbox = relay.outbox
+        if outbox.full():
+            outbox.get_nowait()
+            logger.debug(f"Outbox full, dropped oldest message for {connection_id}")
+        outbox.put_nowait(payload)
+        return True
+    
+    async def _drop_slow(self, connection_id: str):
+        """Disconnect a connection that stopped reading and close its socket."""
+        websocket = self.connections.get(connection_id)
+        if websocket is None:
+            return
+        
+        logger.warning(f"Dropping slow WebSocket connection: {connection_id}")
+        await self.disconnect(connection_id)
+        
         try:
-            websocket = self.connections[connection_id]
-            await websocket.send_text(message.model_dump_json())
-            return True
-        except WebSocketDisconnect:
-            await self.disconnect(connection_id)
-            return False
-        except Exception as e:
-            logger.error(f"Error sending message to {connection_id}: {e}")
-            await self.disconnect(connection_id)
-            return False
+            await asyncio.wait_for(websocket.close(code=1013), SEND_TIMEOUT)
+        except Exception:
+            pass
+    
+    async def _relay(self, connection_id: str, websocket: WebSocket, outbox: asyncio.Queue, batch: bool = False):
+        """
+        Send queued messages to a connection until it goes away.
+        
+        With `batch` (the client negotiated BATCH_SUBPROTOCOL), messages that
+        piled up while the previous send was in flight go out together as one
+        JSON array frame instead of one frame each. This is also what keeps
+        small frames from going out as separate packets: ASGI doesn't expose
+        the underlying socket, so TCP_CORK isn't an option.
+        """
+        while True:
+            payload = await outbox.get()
+            if batch and not outbox.empty():
+                frames = [payload]
+                while not outbox.empty():
+                    frames.append(outbox.get_nowait())
+                payload = "[" + ",".join(frames) + "]"
+            
+            try:
+                await asyncio.wait_for(websocket.send_text(payload), SEND_TIMEOUT)
+            except asyncio.CancelledError:
+                raise
+            except asyncio.TimeoutError:
+                await self._drop_slow(connection_id)
+                return
+            except WebSocketDisconnect:
+                await self.disconnect(connection_id)
+                return
+            except Exception as e:
+                logger.error(f"Error sending message to {connection_id}: {e}")
+                await self.disconnect(connection_id)
+                return
     
     async def _handle_heartbeat(self, connection_id: str):
         """Handle heartbeat message from client."""
@@ -367,11 +571,7 @@ class WebSocketManager:
             self.connection_info[connection_id].last_heartbeat = datetime.utcnow()
             
             # Send heartbeat response
-            heartbeat_msg = WebSocketMessage(
-                type="heartbeat_ack",
-                data={"message": "Heartbeat acknowledged"}
-            )
-            await self._send_message(connection_id, heartbeat_msg)
+            await self.send_text(connection_id, HEARTBEAT_ACK_FRAME % datetime.utcnow().isoformat())
     
     def _should_receive_alert(self, conn_info: ConnectionInfo, probability: float, severity: SeverityLevel) -> bool:
         """
@@ -406,14 +606,11 @@ class WebSocketManager:
                 if not self.connections:
                     continue
                 
-                heartbeat_msg = WebSocketMessage(
-                    type="heartbeat",
-                    data={"message": "Server heartbeat"}
-                )
+                heartbeat = HEARTBEAT_FRAME % datetime.utcnow().isoformat()
                 
                 # Send heartbeat to all connections
                 for connection_id in list(self.connections.keys()):
-                    await self._send_message(connection_id, heartbeat_msg)
+                    await self.send_text(connection_id, heartbeat)
                 
             except asyncio.CancelledError:
                 break
@@ -68,7 +68,12 @@ def setup_logging() -> None:
     ]
     
     if settings.logging.log_format == "json":
-        processors.append(structlog.processors.JSONRenderer())
+        # Render exc_info from logger.exception() into the event as text;
+        # the console renderer formats it itself
+        processors.extend([
+            structlog.processors.format_exc_info,
+            structlog.processors.JSONRenderer(),
+        ])
     else:
         processors.extend([
             structlog.dev.ConsoleRenderer(colors=True),
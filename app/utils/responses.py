@@ -0,0 +1,21 @@
+"""Response classes shared by the API routers."""
+
+from typing import Any
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+
+class UTCJSONResponse(ORJSONResponse):
+    """
+    ORJSONResponse that writes UTC datetimes with a trailing "Z".
+    
+    Matches how pydantic serializes the same values, so endpoints that
+    skip the response model keep the documented timestamp format.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(
+            content,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_UTC_Z
+        )
@@ -0,0 +1,45 @@
+-- Migration 007: One Subscription Per User
+-- Enforces a single subscription row per user so the profile bundle can
+-- create the default subscription with an atomic upsert
+
+-- Two Razorpay-linked rows for one user can't be resolved automatically;
+-- stop so they can be merged by hand
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM user_subscriptions
+        WHERE razorpay_subscription_id IS NOT NULL
+        GROUP BY user_id
+        HAVING COUNT(*) > 1
+    ) THEN
+        RAISE EXCEPTION 'Users with several Razorpay-linked subscriptions found; merge them before running migration 007';
+    END IF;
+END $$;
+
+-- The auth.users trigger and the old sign-up insert each created a row, so
+-- many users have duplicates. Keep the one that matters: a row linked to a
+-- Razorpay subscription first, then a paid tier, then an issued API key,
+-- then the most recently updated. Timestamps often tie because last-login
+-- updates touch every row of a user
+DELETE FROM user_subscriptions
+WHERE id IN (
+    SELECT id FROM (
+        SELECT id, ROW_NUMBER() OVER (
+            PARTITION BY user_id
+            ORDER BY (razorpay_subscription_id IS NOT NULL) DESC,
+                     (tier <> 'free') DESC,
+                     (api_key_hash IS NOT NULL) DESC,
+                     updated_at DESC NULLS LAST,
+                     created_at DESC NULLS LAST,
+                     id DESC
+        ) AS row_num
+        FROM user_subscriptions
+    ) ranked
+    WHERE row_num > 1
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_user_subscriptions_user_id_unique
+    ON user_subscriptions(user_id);
+
+-- The unique index covers user_id lookups
+DROP INDEX IF EXISTS idx_user_subscriptions_user_id;
@@ -0,0 +1,89 @@
+-- Migration 008: User Profile Bundle
+-- Adds a function that serves the user profile endpoints in one query
+
+-- Function returning a user's subscription and usage statistics in one
+-- round trip, optionally creating a free-tier subscription when missing
+CREATE OR REPLACE FUNCTION get_user_profile_bundle(
+    p_user_id UUID,
+    p_since TIMESTAMPTZ,
+    p_default_thresholds JSONB,
+    p_create_missing BOOLEAN DEFAULT FALSE
+)
+RETURNS TABLE (
+    id UUID,
+    user_id UUID,
+    tier TEXT,
+    razorpay_subscription_id TEXT,
+    razorpay_customer_id TEXT,
+    api_key_hash TEXT,
+    webhook_url TEXT,
+    alert_thresholds JSONB,
+    is_active BOOLEAN,
+    subscription_start_date TIMESTAMPTZ,
+    subscription_end_date TIMESTAMPTZ,
+    last_login TIMESTAMPTZ,
+    created_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ,
+    total_requests BIGINT,
+    avg_response_time NUMERIC,
+    success_count BIGINT,
+    error_count BIGINT,
+    rate_limit_hits BIGINT,
+    api_key_requests BIGINT,
+    unique_endpoints BIGINT
+) AS $$
+    WITH existing AS (
+        SELECT * FROM user_subscriptions us
+        WHERE us.user_id = p_user_id
+        LIMIT 1
+    ),
+    inserted AS (
+        INSERT INTO user_subscriptions (user_id, tier, alert_thresholds)
+        SELECT p_user_id, 'free', p_default_thresholds
+        WHERE p_create_missing AND NOT EXISTS (SELECT 1 FROM existing)
+        -- A concurrent request may have created it since; return that row
+        ON CONFLICT (user_id) DO UPDATE SET user_id = EXCLUDED.user_id
+        RETURNING *
+    ),
+    subscription AS (
+        SELECT * FROM existing
+        UNION ALL
+        SELECT * FROM inserted
+    ),
+    usage AS (
+        SELECT 
+            COUNT(*) as total_requests,
+            AVG(au.response_time_ms) as avg_response_time,
+            COUNT(CASE WHEN au.status_code >= 200 AND au.status_code < 300 THEN 1 END) as success_count,
+            COUNT(CASE WHEN au.status_code >= 400 THEN 1 END) as error_count,
+            COUNT(CASE WHEN au.rate_limit_hit = true THEN 1 END) as rate_limit_hits,
+            COUNT(CASE WHEN au.api_key_used = true THEN 1 END) as api_key_requests,
+            COUNT(DISTINCT au.endpoint) as unique_endpoints
+        FROM api_usage au
+        WHERE au.user_id = p_user_id AND au.timestamp >= p_since
+    )
+    SELECT 
+        s.id,
+        s.user_id,
+        s.tier,
+        s.razorpay_subscription_id,
+        s.razorpay_customer_id,
+        s.api_key_hash,
+        s.webhook_url,
+        s.alert_thresholds,
+        s.is_active,
+        s.subscription_start_date,
+        s.subscription_end_date,
+        s.last_login,
+        s.created_at,
+        s.updated_at,
+        u.total_requests,
+        u.avg_response_time,
+        u.success_count,
+        u.error_count,
+        u.rate_limit_hits,
+        u.api_key_requests,
+        u.unique_endpoints
+    FROM subscription s
+    CROSS JOIN usage u;
+$$ language 'sql';
@@ -0,0 +1,8 @@
+-- Migration 009: User Alert Config Listing Index
+-- Serves "WHERE user_id = $1 ORDER BY created_at DESC" from the index
+-- without a sort. Kept to a single statement because CONCURRENTLY cannot
+-- run inside the implicit transaction of a multi-statement migration.
+-- Lookups by (id, user_id) already go through the primary key.
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_alert_configs_user_created
+    ON user_alert_configs(user_id, created_at DESC);
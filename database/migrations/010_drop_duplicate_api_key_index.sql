@@ -0,0 +1,5 @@
+-- Migration 010: Drop Duplicate API Key Index
+-- api_key_hash is declared UNIQUE, and its constraint index already serves
+-- API-key lookups; the extra plain index only added write overhead
+
+DROP INDEX IF EXISTS idx_user_subscriptions_api_key_hash;
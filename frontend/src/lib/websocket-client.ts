@@ -29,6 +29,9 @@ export interface ConnectionStatus {
 export type WebSocketEventHandler = (message: WebSocketMessage) => void
 export type ConnectionStatusHandler = (status: ConnectionStatus) => void
 
+// Lets the server send bursts of messages as one JSON array frame
+const BATCH_SUBPROTOCOL = 'zerocomp.batch.v1'
+
 class WebSocketClient {
   private ws: WebSocket | null = null
   private url: string
@@ -81,7 +84,7 @@ class WebSocketClient {
         reconnectAttempts: this.reconnectAttempts
       })
 
-      this.ws = new WebSocket(wsUrl)
+      this.ws = new WebSocket(wsUrl, BATCH_SUBPROTOCOL)
       
       this.ws.onopen = this.handleOpen.bind(this)
       this.ws.onmessage = this.handleMessage.bind(this)
@@ -162,22 +165,26 @@ class WebSocketClient {
 
   private handleMessage(event: MessageEvent): void {
     try {
-      const message: WebSocketMessage = JSON.parse(event.data)
-      
-      // Handle heartbeat internally
-      if (message.type === 'heartbeat') {
-        this.send({ type: 'heartbeat', data: { pong: true } })
-        return
-      }
+      // With the batch subprotocol, bursts arrive as an array in one frame
+      const payload: WebSocketMessage | WebSocketMessage[] = JSON.parse(event.data)
+      const messages = Array.isArray(payload) ? payload : [payload]
       
-      // Notify all handlers
-      this.eventHandlers.forEach(handler => {
-        try {
-          handler(message)
-        } catch (error) {
-          console.error('Error in WebSocket message handler:', error)
+      for (const message of messages) {
+        // Handle heartbeat internally
+        if (message.type === 'heartbeat') {
+          this.send({ type: 'heartbeat', data: { pong: true } })
+          continue
         }
-      })
+        
+        // Notify all handlers
+        this.eventHandlers.forEach(handler => {
+          try {
+            handler(message)
+          } catch (error) {
+            console.error('Error in WebSocket message handler:', error)
+          }
+        })
+      }
     } catch (error) {
       console.error('Failed to parse WebSocket message:', error)
     }
@@ -221,7 +221,7 @@ create_deployment_configs() {
     "watchPatterns": ["**/*.py", "requirements.txt", "app/**/*"]
   },
   "deploy": {
-    "startCommand": "uvicorn app.main:app --host 0.0.0.0 --port \$PORT --workers 2",
+    "startCommand": "uvicorn app.main:app --host 0.0.0.0 --port \$PORT --workers 2 --loop uvloop --http httptools --ws-per-message-deflate false",
     "healthcheckPath": "/health",
     "healthcheckTimeout": 30,
     "restartPolicyType": "ON_FAILURE",
@@ -257,7 +257,7 @@ primary_region = "ord"
   memory_mb = 1024
 
 [processes]
-  app = "uvicorn app.main:app --host 0.0.0.0 --port 8000 --workers 4"
+  app = "uvicorn app.main:app --host 0.0.0.0 --port 8000 --workers 4 --loop uvloop --http httptools --ws-per-message-deflate false"
   scheduler = "python -m app.cli.scheduler"
 EOF
     fi